@@ -0,0 +1,132 @@
+import argparse, time
+import numpy as np
+import pandas as pd
+import exchange, indicators
+from strategies.crossover import MIN_HISTORY as CROSSOVER_MIN_HISTORY
+from strategies.support import support_history
+
+# 🧪 과거 재현(백테스트): 돌파/지지 규칙을 (종목 × 일) 행렬 전체에 한 번에 적용
+# 1) fetch: 일봉 이력을 받아 .npz 하나로 저장 (여기만 네트워크 사용)
+# 2) run: 저장된 이력으로 신호 시점과 이후 수익률을 오프라인으로 계산
+# 재현에서는 그날 종가를 현재가로, 그날 최종 저가를 저가로 본다
+HORIZONS = (1, 3, 7, 14, 30)
+HISTORY_DAYS = 365 * 5
+FIELDS = ('open', 'high', 'low', 'close')
+SUPPORT_RULES = ('watch', 'support', 'reversal')
+
+def fetch_history(tickers, days=HISTORY_DAYS):
+    frames = {}
+    for t in tickers:
+        try:
+            df = exchange.get_ohlcv(t, interval="day", count=days)
+        except Exception as e:
+            print(f"❌ {t} 이력 조회 실패: {e}")
+            continue
+        if df is not None and not df.empty:
+            frames[t] = df
+    return frames
+
+# 모든 종목을 같은 날짜 축에 맞춘다 (상장 전/빠진 날은 NaN)
+def save_history(path, frames):
+    tickers = list(frames)
+    dates = pd.DatetimeIndex(sorted(set().union(*(df.index for df in frames.values()))))
+    arrays = {f: np.vstack([frames[t][f].reindex(dates).to_numpy(dtype=float) for t in tickers]) for f in FIELDS}
+    np.savez_compressed(path, tickers=np.array(tickers), dates=dates.to_numpy(), **arrays)
+
+def load_history(path):
+    with np.load(path) as data:
+        return {k: data[k] for k in data.files}
+
+# h일 뒤 종가 기준 수익률 (이력 밖이면 NaN)
+def forward_returns(close, horizons=HORIZONS):
+    out = {}
+    for h in horizons:
+        fwd = np.full(close.shape, np.nan)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            fwd[:, :-h] = close[:, h:] / close[:, :-h] - 1
+        out[h] = fwd
+    return out
+
+# 규칙별 (종목 × 일) 불리언 마스크
+def signal_timelines(hist):
+    close, low = hist['close'], hist['low']
+    bands = indicators.compute_bands(close)
+    rules = indicators.crossover_history(close, bands)
+    # 실시간 전략과 같게: 그날까지 받은 봉이 MIN_HISTORY 개 이상인 종목만
+    seen = np.cumsum(~np.isnan(close), axis=1)
+    for name in rules:
+        rules[name] &= seen >= CROSSOVER_MIN_HISTORY
+    support = support_history(close, low, bands['MA7'], bands['BBD'])
+    # 녹색불은 실시간 보고서처럼 목록에 오른 종목에 붙는 표시라서 목록별로만 센다
+    for name in SUPPORT_RULES:
+        rules[name] = support[name]
+    for name in SUPPORT_RULES:
+        rules[f'{name}_green'] = support[name] & support['green']
+    return rules
+
+def replay(hist, horizons=HORIZONS):
+    close = hist['close']
+    rules = signal_timelines(hist)
+    fwd = forward_returns(close, horizons)
+    parts = []
+    for name, mask in rules.items():
+        rows, cols = np.nonzero(mask)
+        part = pd.DataFrame({
+            'date': hist['dates'][cols],
+            'ticker': hist['tickers'][rows],
+            'rule': name,
+            'close': close[rows, cols],
+        })
+        for h in horizons:
+            part[f'fwd_{h}'] = fwd[h][rows, cols]
+        parts.append(part)
+    return pd.concat(parts, ignore_index=True)
+
+# 규칙별 건수, 평균/중앙 수익률, 승률 (이후 수익률을 알 수 있는 신호만)
+def summarize(events, horizons=HORIZONS):
+    rows = []
+    for name, group in events.groupby('rule', sort=False):
+        row = {'rule': name, 'count': len(group)}
+        for h in horizons:
+            r = group[f'fwd_{h}'].dropna()
+            row[f'mean_{h}'] = r.mean() * 100 if len(r) else np.nan
+            row[f'median_{h}'] = r.median() * 100 if len(r) else np.nan
+            row[f'win_{h}'] = (r > 0).mean() * 100 if len(r) else np.nan
+        rows.append(row)
+    return pd.DataFrame(rows).set_index('rule')
+
+def main():
+    parser = argparse.ArgumentParser(description="돌파/지지 규칙 과거 재현")
+    sub = parser.add_subparsers(dest='command', required=True)
+    f = sub.add_parser('fetch', help="일봉 이력 받아 저장")
+    f.add_argument('--fiat', default="KRW")
+    f.add_argument('--days', type=int, default=HISTORY_DAYS)
+    f.add_argument('--out', default="history.npz")
+    r = sub.add_parser('run', help="저장된 이력으로 재현")
+    r.add_argument('--history', default="history.npz")
+    r.add_argument('--horizons', default=",".join(map(str, HORIZONS)))
+    r.add_argument('--events', help="신호 목록 CSV 저장 경로")
+    args = parser.parse_args()
+
+    if args.command == 'fetch':
+        frames = fetch_history(exchange.get_tickers(fiat=args.fiat), args.days)
+        save_history(args.out, frames)
+        print(f"✅ {len(frames)}종목 저장: {args.out}")
+        return
+
+    horizons = tuple(int(h) for h in args.horizons.split(","))
+    hist = load_history(args.history)
+    start = time.perf_counter()
+    events = replay(hist, horizons)
+    summary = summarize(events, horizons)
+    elapsed = time.perf_counter() - start
+
+    ticker_years = hist['close'].shape[0] * hist['close'].shape[1] / 365
+    with pd.option_context('display.width', 200, 'display.max_columns', None, 'display.float_format', '{:.2f}'.format):
+        print(summary)
+    print(f"⏱️ {len(events)}건, {elapsed:.2f}초 ({ticker_years / elapsed:,.0f} ticker-years/s)")
+    if args.events:
+        events.to_csv(args.events, index=False)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+import argparse, asyncio, json, os, time, tracemalloc
+
+# ⏱️ 오프라인 성능 측정: 로컬 외부 API 대역(fake_exchange)으로 종목 수별 단계 시간을 잰다
+# 단계마다 걸린 시간, 외부 요청 수, 최대 메모리(tracemalloc), 캔들 캐시 적중률을 보고한다
+os.environ.setdefault('BOT_TOKEN', "bench")
+os.environ.setdefault('CHAT_ID', "0")
+
+import exchange, btc_summary, telegram
+import fake_exchange
+from engine import ScanEngine
+from strategies import CrossoverStrategy, SupportStrategy
+from strategies.crossover import DAYS
+
+TICKER_COUNTS = (50, 200, 1000)
+LATENCY = 0.02
+
+class Meter:
+    def __init__(self, fake, engine, trace=True):
+        self.fake = fake
+        self.engine = engine
+        self.trace = trace
+        self.rows = []
+
+    async def measure(self, stage, tickers, func):
+        store = self.engine.store
+        hits, misses = store.hits, store.misses
+        requests = self.fake.request_count
+        if self.trace:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        result = func()
+        if asyncio.iscoroutine(result):
+            result = await result
+        wall = time.perf_counter() - start
+        lookups = store.hits - hits + store.misses - misses
+        self.rows.append({
+            'stage': stage,
+            'tickers': tickers,
+            'wall': wall,
+            'requests': self.fake.request_count - requests,
+            'peak_mb': tracemalloc.get_traced_memory()[1] / 2 ** 20 if self.trace else None,
+            'hit_rate': (store.hits - hits) / lookups * 100 if lookups else None,
+        })
+        return result
+
+# 원래 main.py / main_t.py 함수 이름 기준으로 단계를 나눈다
+async def bench_tickers(fake, count, trace):
+    crossover, support = CrossoverStrategy(), SupportStrategy()
+    engine = ScanEngine([crossover, support], events_path=None, snapshot_path=None)
+    meter = Meter(fake, engine, trace)
+    await meter.measure("pass (cold)", count, lambda: _pass(engine))
+    ctx = await meter.measure("pass (warm)", count, lambda: _pass(engine))
+    await meter.measure("scan_status", count, lambda: support.scan(ctx, engine))
+    await meter.measure("check_conditions", count, lambda: crossover.check_live(ctx))
+    await meter.measure("send_past_summary", count, lambda: _past_summary(crossover, ctx, engine))
+    await meter.measure("get_btc_summary_block", count, btc_summary.get_btc_summary_block)
+    return meter.rows
+
+# 보고서가 실제로 나갈 때까지 (텔레그램 큐 비우기 포함)
+async def _pass(engine):
+    ctx = await engine.run_pass()
+    await telegram.flush()
+    return ctx
+
+async def _past_summary(strategy, ctx, engine):
+    strategy.check_past(ctx, engine, [1, 2])
+    return await strategy.render(strategy.signals, strategy.breadth.counts(ctx.frames, DAYS), ctx)
+
+def lift_rate_limits():
+    for bucket in list(exchange.buckets.values()) + [telegram.outbox.chat, telegram.outbox.group]:
+        bucket.rate = 1e9
+
+def print_rows(rows):
+    print(f"{'stage':<22}{'tickers':>8}{'wall(s)':>10}{'requests':>10}{'peak(MB)':>10}{'hit%':>8}")
+    for r in rows:
+        peak = f"{r['peak_mb']:.1f}" if r['peak_mb'] is not None else "-"
+        hit = f"{r['hit_rate']:.0f}" if r['hit_rate'] is not None else "-"
+        print(f"{r['stage']:<22}{r['tickers']:>8}{r['wall']:>10.3f}{r['requests']:>10}{peak:>10}{hit:>8}")
+
+async def run(args):
+    if args.fixtures:
+        base = fake_exchange.rebase_fixtures(fake_exchange.load_fixtures(args.fixtures))
+    else:
+        base = fake_exchange.synthetic_fixtures(max(args.tickers))
+    fake = fake_exchange.FakeExchange(base, latency=args.latency).start()
+    fake.install(exchange.session)
+    if not args.real_limits:
+        lift_rate_limits()
+    if args.trace:
+        tracemalloc.start()
+    rows = []
+    try:
+        for count in args.tickers:
+            fake.fixtures = fake_exchange.scale_fixtures(base, count)
+            rows += await bench_tickers(fake, count, args.trace)
+    finally:
+        if args.trace:
+            tracemalloc.stop()
+        fake.uninstall(exchange.session)
+        fake.stop()
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 스캔 성능 측정")
+    sub = parser.add_subparsers(dest='command', required=True)
+    r = sub.add_parser('run', help="대역 서버로 측정")
+    r.add_argument('--fixtures', help="record 로 저장한 응답 파일 (없으면 가짜 데이터 생성)")
+    r.add_argument('--tickers', default=",".join(map(str, TICKER_COUNTS)))
+    r.add_argument('--latency', type=float, default=LATENCY, help="요청당 지연(초)")
+    r.add_argument('--real-limits', action='store_true', help="Upbit 요청 한도를 실제처럼 적용")
+    r.add_argument('--no-trace', dest='trace', action='store_false', help="메모리 추적 끄기 (시간만 측정)")
+    r.add_argument('--json', help="결과 저장 경로 (회귀 비교용)")
+    rec = sub.add_parser('record', help="실제 API 응답 기록 (네트워크 필요)")
+    rec.add_argument('--out', default="fixtures.json.gz")
+    rec.add_argument('--days', type=int, default=200)
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        tickers = exchange.get_tickers(fiat="KRW")
+        fake_exchange.record_fixtures(args.out, tickers, args.days)
+        print(f"✅ {len(tickers)}종목 기록: {args.out}")
+        return
+
+    args.tickers = [int(n) for n in args.tickers.split(",")]
+    rows = asyncio.run(run(args))
+    print_rows(rows)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(rows, f, indent=2)
+
+if __name__ == '__main__':
+    main()
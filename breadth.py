@@ -0,0 +1,48 @@
+import numpy as np
+import indicators
+
+# 📊 시장 상승/하락 종목 수: 여러 날을 캔들 행렬 한 번으로 계산
+# 이미 마감된 날(offset >= 1)은 다음 일봉이 열릴 때까지 그대로 재사용하고, 진행 중인 D-day 만 매번 센다
+class MarketBreadth:
+    def __init__(self):
+        self.closed = {}        # offset -> (up, down)
+        self.closed_candle = None
+
+    def count(self, frames, offsets):
+        dfs = list(frames.values())
+        if not dfs:
+            return {o: (0, 0) for o in offsets}
+        days = max(offsets) + 2
+        opens = indicators.stack_field(dfs, 'open', days=days)
+        closes = indicators.stack_field(dfs, 'close', days=days)
+        lengths = np.array([len(df) for df in dfs])
+        offsets = np.array(offsets)
+        cols = -(offsets + 1)
+        o, c = opens[:, cols], closes[:, cols]
+        # 기존 규칙 그대로: 해당 날 앞에 하루치가 더 있고 시가가 0이 아닌 종목만
+        valid = (lengths[:, None] >= offsets + 2) & (o != 0) & ~np.isnan(o) & ~np.isnan(c)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rate = (c - o) / o
+        up = ((rate > 0) & valid).sum(axis=0)
+        down = ((rate < 0) & valid).sum(axis=0)
+        return {int(off): (int(u), int(d)) for off, u, d in zip(offsets, up, down)}
+
+    def counts(self, frames, offsets):
+        latest = max((df.index[-1] for df in frames.values()), default=None)
+        if latest != self.closed_candle:
+            self.closed = {}
+            self.closed_candle = latest
+        todo = [o for o in offsets if o == 0 or o not in self.closed]
+        result = self.count(frames, todo) if todo else {}
+        for o, value in result.items():
+            if o > 0:
+                self.closed[o] = value
+        return {o: result.get(o, self.closed.get(o)) for o in offsets}
+
+# {offset: (up, down)} -> {offset: "x% (up / down)"} (여러 샤드 개수를 더한 뒤에도 쓴다)
+def ratio_text(counts):
+    texts = {}
+    for o, (up, down) in counts.items():
+        total = up + down
+        texts[o] = f"{round(up / total * 100, 1)}% ({up} / {down})" if total > 0 else ""
+    return texts
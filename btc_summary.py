@@ -0,0 +1,147 @@
+import asyncio, re
+import pandas as pd
+from datetime import datetime, timedelta, timezone
+from ratelimit import PRIORITY_LIVE
+from reference import ReferenceData
+from resample import bin_start, KST_OFFSET
+from metrics import SILENT_FAILURES
+import exchange
+
+# ₿ 요약 머리말: 환율, UPBIT/BYBIT BTC 일간 변동률, 최근 16시간 시간봉 변동률
+# 네 출처를 동시에 받고 출처별 TTL 동안 재사용한다. 실패하면 마지막으로 받은 값을 쓴다
+FX_URL = "https://finance.naver.com/marketindex/"
+BYBIT_URL = "https://api.bybit.com/v5/market/kline?category=linear&symbol=BTCUSDT&interval=D&limit=10"
+FX_TTL = 1800           # 환율은 자주 바뀌지 않는다
+BYBIT_TTL = 300
+UPBIT_TTL = 60          # 오늘 봉 종가가 현재가라 짧게
+HOURS = 17
+
+# 페이지 전체를 파싱하지 않고 첫 번째 head_info(USD) 조각만 본다
+def parse_usdkrw(html):
+    start = html.find('class="head_info')
+    if start < 0:
+        raise ValueError("환율 영역을 찾을 수 없음")
+    part = html[start:html.find('</div>', start)]
+    today = float(_span(part, "value").replace(",", ""))
+    diff = float(_span(part, "change").replace(",", "").replace("+", "").replace("-", ""))
+    direction = " ".join(re.findall(r'<span class="blind">([^<]*)</span>', part))
+    yesterday = today + diff if "하락" in direction else today - diff
+    return today, yesterday
+
+def _span(part, cls):
+    match = re.search(rf'<span class="{cls}">([^<]*)</span>', part)
+    if match is None:
+        raise ValueError(f"환율 {cls} 값 없음")
+    return match.group(1).strip()
+
+async def fetch_usdkrw():
+    return parse_usdkrw(await exchange.aget_text(FX_URL))
+
+async def fetch_bybit_day_rates():
+    today_date = datetime.now(timezone.utc).date().strftime("%Y-%m-%d")
+    yesterday_date = (datetime.now(timezone.utc).date() - timedelta(days=1)).strftime("%Y-%m-%d")
+    data = await exchange.aget_json(BYBIT_URL)
+    ohlcv = data.get('result', {}).get('list', [])
+    today_rate = yesterday_rate = today_close = 0.0
+
+    for candle in ohlcv:
+        ts = int(candle[0]) // 1000
+        candle_date = datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%d")
+        if candle_date == today_date:
+            open_t = float(candle[1])
+            close_t = float(candle[4])
+            today_rate = round((close_t - open_t) / open_t * 100, 2)
+            today_close = close_t
+        elif candle_date == yesterday_date:
+            open_y = float(candle[1])
+            close_y = float(candle[4])
+            yesterday_rate = round((close_y - open_y) / open_y * 100, 2)
+
+    return today_rate, yesterday_rate, today_close
+
+async def fetch_upbit_day():
+    df = await exchange.aget_ohlcv("KRW-BTC", interval="day", count=2, priority=PRIORITY_LIVE)
+    if df is None or len(df) < 2:
+        raise ValueError("UPBIT 일봉 데이터 부족")
+    return df
+
+async def fetch_upbit_hours():
+    df = await exchange.aget_ohlcv("KRW-BTC", interval="minute60", count=HOURS, priority=PRIORITY_LIVE)
+    if df is None or len(df) < HOURS:
+        raise ValueError("UPBIT 시간봉 데이터 부족")
+    return df
+
+reference = ReferenceData()
+reference.add("usdkrw", fetch_usdkrw, FX_TTL)
+reference.add("bybit", fetch_bybit_day_rates, BYBIT_TTL, default=(0.0, 0.0, 0.0))
+reference.add("upbit_day", fetch_upbit_day, UPBIT_TTL)
+reference.add("upbit_hour", fetch_upbit_hours, UPBIT_TTL)
+
+# 엔진이 이번 패스에 가진 KRW-BTC 봉과 현재가가 있으면 요청은 생략한다
+# (마지막 봉이 지금 진행 중인 봉일 때만. 그 봉의 종가는 스냅샷 현재가로 바꿔 쓴다)
+def _live_candles(ctx, interval, count):
+    if ctx is None:
+        return None
+    df = ctx.candles("KRW-BTC", interval)
+    if df is None and interval == "day":
+        df = ctx.frames.get("KRW-BTC")
+    price = ctx.snapshot.get("KRW-BTC")
+    if df is None or len(df) < count or not price or df.index[-1] != _current_candle(interval):
+        return None
+    df = df.iloc[-count:].copy()
+    df.iloc[-1, df.columns.get_loc('close')] = price
+    return df
+
+def _current_candle(interval):
+    now = pd.Timestamp(datetime.now(timezone.utc).replace(tzinfo=None))
+    return bin_start(pd.DatetimeIndex([now + KST_OFFSET]), interval)[0]
+
+async def _upbit_day(ctx):
+    df = _live_candles(ctx, "day", 2)
+    return df if df is not None else await reference.get("upbit_day")
+
+async def _upbit_hours(ctx):
+    df = _live_candles(ctx, "minute60", HOURS)
+    return df if df is not None else await reference.get("upbit_hour")
+
+async def get_btc_summary_block(ctx=None):
+    try:
+        (usdkrw_today, usdkrw_yesterday), df, bybit, df_hour = await asyncio.gather(
+            reference.get("usdkrw"), _upbit_day(ctx), reference.get("bybit"), _upbit_hours(ctx))
+
+        today_open = df.iloc[-1]['open']
+        today_close = df.iloc[-1]['close']
+        yesterday_open = df.iloc[-2]['open']
+        yesterday_close = df.iloc[-2]['close']
+        upbit_price = int(today_close)
+        upbit_usd = int(upbit_price / usdkrw_today)
+        upbit_today_rate = round((today_close - today_open) / today_open * 100, 2)
+        upbit_yesterday_rate = round((yesterday_close - yesterday_open) / yesterday_open * 100, 2)
+
+        bybit_today_rate, bybit_yesterday_rate, bybit_close = bybit
+        bybit_price_krw = int(bybit_close * usdkrw_today)
+        bybit_price_usd = int(bybit_close)
+
+        changes = []
+        for i in range(1, HOURS):
+            open_price = df_hour.iloc[i - 1]['close']
+            close_price = df_hour.iloc[i]['close']
+            rate = round((close_price - open_price) / open_price * 100, 2)
+            changes.append(rate)
+
+        lines = [
+            f"📊₿TC info  💱 {usdkrw_today:.1f} ({usdkrw_yesterday:.1f})",
+            f"UPBIT  {upbit_price / 1e8:.2f}억  {upbit_today_rate:+.2f}% ({upbit_yesterday_rate:+.2f}%)  ${upbit_usd:,}",
+            f"BYBIT  {bybit_price_krw / 1e8:.2f}억  {bybit_today_rate:+.2f}% ({bybit_yesterday_rate:+.2f}%)  ${bybit_price_usd:,}",
+            "4H rate (1H rate)"
+        ]
+        for i in range(0, len(changes), 4):
+            block = changes[i:i+4]
+            block_total = round(sum(block), 2)
+            block_line = f"{block_total:+.2f}% ・{'  '.join([f'{r:+.2f}' for r in block])}"
+            lines.append(block_line)
+
+        return "\n".join(lines)
+    except Exception as e:
+        SILENT_FAILURES.inc(where="btc_summary")
+        return f"❌ BTC 요약 오류: {e}"
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+# 🧱 캔들 링 버퍼: 필드마다 (종목 행 × 칸) 연속 배열 하나에 모든 종목을 담는다
+# 종목마다 [start, end) 구간이 이력이고, 새 봉은 end 뒤 빈칸에 쓴다 (진행 중인 마지막 봉은 제자리에 덮어씀)
+# 빈칸이 떨어지면 그 행만 앞으로 당긴다 (SLACK 봉마다 한 번). 봉을 굴리는 동안 새 배열은 만들지 않는다
+# window() 는 복사 없는 읽기 전용 뷰라서, 그 종목을 다음에 갱신하면 내용이 바뀐다 (패스 안에서만 쓸 것)
+# 부를 때마다 DataFrame 껍데기는 새로 만든다 (받은 쪽이 열을 붙여도 다른 곳에 새지 않는다)
+# 내보낸 종목의 행은 recycle() 전까지 다른 종목에 주지 않는다 (패스 도중 내보내도 이미 건넨 뷰는 그대로)
+# 빈 행이 없으면 배열을 새로 키우고, 이전 배열은 그 위의 뷰가 남아 있는 동안 살아 있다
+SLACK = 32
+GROW = 16               # 종목 행은 모자랄 때 두 배씩 늘린다 (처음 GROW 행)
+
+class CandleRing:
+    def __init__(self, fields, history):
+        self.dtypes = dict(fields)      # 필드 -> dtype (순서가 DataFrame 열 순서)
+        self.history = history
+        self.width = history + SLACK
+        self.rows = {}                  # ticker -> 행 번호
+        self.free = []
+        self.retired = []               # 내보냈지만 아직 다시 쓰면 안 되는 행
+        self.fields = {}
+        self.times = np.zeros((0, self.width), dtype=np.int64)
+        self.start = np.zeros(0, dtype=np.int64)
+        self.end = np.zeros(0, dtype=np.int64)
+        self._grow(GROW)
+
+    def _grow(self, count):
+        old = len(self.start)
+        size = old + count
+        for name, dtype in self.dtypes.items():
+            array = np.full((size, self.width), np.nan, dtype=dtype)
+            if name in self.fields:
+                array[:old] = self.fields[name]
+            self.fields[name] = array
+        times = np.zeros((size, self.width), dtype=np.int64)
+        times[:old] = self.times
+        self.times = times
+        self.start = np.concatenate([self.start, np.zeros(count, dtype=np.int64)])
+        self.end = np.concatenate([self.end, np.zeros(count, dtype=np.int64)])
+        self.free.extend(range(size - 1, old - 1, -1))
+
+    def _row(self, ticker):
+        row = self.rows.get(ticker)
+        if row is None:
+            if not self.free:
+                self._grow(len(self.start))
+            row = self.rows[ticker] = self.free.pop()
+            self.start[row] = self.end[row] = 0
+        return row
+
+    def release(self, ticker):
+        row = self.rows.pop(ticker, None)
+        if row is not None:
+            self.retired.append(row)
+
+    # 이전 패스의 뷰를 더 쓰지 않을 때 (패스 시작) 내보낸 행을 다시 쓸 수 있게 한다
+    def recycle(self):
+        self.free.extend(self.retired)
+        self.retired.clear()
+
+    def write(self, ticker, new, reset=False):
+        times = new.index.values.astype('datetime64[ns]').view(np.int64)
+        self.write_arrays(ticker, times, [new[name].to_numpy() for name in self.fields], reset)
+
+    # 첫 봉 시각부터는 새 값으로 바꾸고, 그 앞 이력은 history 개까지만 남긴다 (reset 이면 전부 버림)
+    # times 는 int64 나노초, columns 는 필드 순서대로 (2차원 배열이면 열 순서)
+    def write_arrays(self, ticker, times, columns, reset=False):
+        times = times[-self.history:]
+        row = self._row(ticker)
+        start, end = int(self.start[row]), int(self.end[row])
+        if reset:
+            end = start
+        cut = start + int(np.searchsorted(self.times[row, start:end], times[0]))
+        n = len(times)
+        start = max(start, cut + n - self.history)
+        if cut + n > self.width:
+            kept = max(cut - start, 0)
+            for array in (self.times, *self.fields.values()):
+                array[row, :kept] = array[row, start:start + kept]
+            start, cut = 0, kept
+        self.times[row, cut:cut + n] = times
+        for k, array in enumerate(self.fields.values()):
+            array[row, cut:cut + n] = columns[:, k][-n:] if isinstance(columns, np.ndarray) else columns[k][-n:]
+        self.start[row], self.end[row] = start, cut + n
+
+    def window(self, ticker):
+        row = self.rows.get(ticker)
+        if row is None:
+            return None
+        span = slice(self.start[row], self.end[row])
+        index = pd.DatetimeIndex(self.times[row, span].view('datetime64[ns]'), copy=False)
+        columns = {}
+        for name, array in self.fields.items():
+            columns[name] = array[row, span]
+            columns[name].flags.writeable = False
+        return pd.DataFrame(columns, index=index, copy=False)
@@ -0,0 +1,213 @@
+import asyncio, threading, time
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+import exchange
+from candle_ring import CandleRing
+from metrics import CACHE_EVENTS
+from ratelimit import PRIORITY_NORMAL
+
+# 🕯️ 종목별 캔들 이력 저장소
+# 처음 한 번만 전체를 받고, 이후에는 마지막 캔들(진행 중인 봉) 이후만 받아 이어 붙인다
+# 스레드와 이벤트 루프 어디서 불러도 되고, 같은 종목을 동시에 놓치면 요청 하나를 같이 기다린다
+# LRU 순서로 넘치는 것만 내보내고, 만료는 꺼낼 때만 확인한다 (넣을 때 전체를 훑지 않음)
+# 봉 데이터는 종목별 DataFrame 대신 필드별 링 버퍼(candle_ring)에 두고, 꺼낼 때 복사 없는 뷰로 준다
+# 가격은 밴드와 비교하고 그대로 표시하므로 float64, 거래량/거래대금은 float32
+FIELDS = {
+    'open': np.float64,
+    'high': np.float64,
+    'low': np.float64,
+    'close': np.float64,
+    'volume': np.float32,
+    'value': np.float32,
+}
+COLUMNS = list(FIELDS)
+INTERVAL_SECONDS = {
+    "day": 86400,
+    "week": 7 * 86400,
+    "minute60": 3600,
+    "minute240": 4 * 3600,
+}
+KST = timezone(timedelta(hours=9))
+COUNTERS = {"hit": "hits", "miss": "misses", "coalesced": "coalesced", "eviction": "evictions"}
+WEEK_OFFSET = 4 * 86400     # 1970-01-01 은 목요일, 주봉은 월요일 00:00 UTC 에 시작
+
+# now(유닉스 초)가 속한 봉의 시작 시각 (유닉스 초, Upbit 처럼 UTC 기준 경계)
+def candle_start(now, interval):
+    step = INTERVAL_SECONDS[interval]
+    offset = WEEK_OFFSET if interval == "week" else 0
+    return now - (now - offset) % step
+
+# 저장소에 넣는 DataFrame 은 읽기 전용 배열 위에 만든다 (제자리 수정은 ValueError, 잘라 쓴 뒤 고치는 것은 복사본)
+def freeze(df):
+    values = df[COLUMNS].to_numpy(dtype=np.float64)
+    if values.flags.writeable:
+        values.setflags(write=False)
+    return pd.DataFrame(values, index=df.index, columns=COLUMNS, copy=False)
+
+class CandleStore:
+    def __init__(self, history=200, interval="day", max_age=3600, max_size=300):
+        self.history = history
+        self.interval = interval
+        self.max_age = max_age      # 이 시간 안에 갱신했으면 그대로 사용
+        self.max_size = max_size
+        self.entries = OrderedDict()  # ticker -> 갱신 시각 (LRU 순서)
+        self.ring = CandleRing(FIELDS, history)
+        self.lock = threading.RLock()
+        self.loading = {}           # ticker -> 진행 중인 요청 (스레드든 이벤트 루프든 같은 Future 를 기다린다)
+        self.tasks = set()          # 이벤트 루프에서 받는 중인 작업 (끝날 때까지 참조를 잡아 둔다)
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0          # 진행 중인 요청에 얹혀 기다린 횟수
+        self.evictions = 0
+
+    def _count(self, event):
+        name = COUNTERS[event]
+        with self.lock:
+            setattr(self, name, getattr(self, name) + 1)
+        CACHE_EVENTS.inc(cache=self.interval, event=event)
+
+    # 마지막 캔들부터 지금까지 받아야 할 개수 (마지막 봉도 다시 받아 덮어쓴다)
+    def missing_count(self, df, now=None):
+        if df is None or len(df) == 0:
+            return self.history
+        now = now or datetime.now(KST).replace(tzinfo=None)
+        elapsed = (now - df.index[-1].to_pydatetime()).total_seconds()
+        gap = int(elapsed // INTERVAL_SECONDS[self.interval]) + 1
+        return min(max(gap, 1), self.history)
+
+    # 받은 봉을 링에 이어 쓴다. 기존 마지막 봉과 겹치지 않으면 사이가 비었으므로 None (전체를 다시 받는다)
+    def merge(self, ticker, old, new, count):
+        if new is None or len(new) == 0:
+            return old
+        if count >= self.history:
+            return self.store(ticker, new, reset=True)
+        if old is None or new.index[0] > old.index[-1]:
+            return None
+        return self.store(ticker, new)
+
+    def lookup(self, ticker):
+        with self.lock:
+            refreshed = self.entries.get(ticker)
+            if refreshed is None:
+                return None
+            self.entries.move_to_end(ticker)
+            return {'df': self.ring.window(ticker), 'time': refreshed}
+
+    # 봉이 바뀐 뒤에는 TTL 이 남아 있어도 다시 받는다 (마감 직후 패스가 방금 닫힌 봉을 보도록)
+    def fresh(self, ticker):
+        entry = self.lookup(ticker)
+        now = time.time()
+        if entry is not None and now - entry['time'] < self.max_age and entry['time'] >= candle_start(now, self.interval):
+            self._count("hit")
+            return entry['df']
+        self._count("miss")
+        return None
+
+    # refreshed 를 주면 그 시각에 갱신한 것으로 (스냅샷 복원용)
+    def store(self, ticker, new, reset=False, refreshed=None):
+        evicted = 0
+        with self.lock:
+            self.ring.write(ticker, new, reset=reset)
+            self.entries[ticker] = time.time() if refreshed is None else refreshed
+            self.entries.move_to_end(ticker)
+            while len(self.entries) > self.max_size:
+                old, _ = self.entries.popitem(last=False)
+                self.ring.release(old)
+                evicted += 1
+            df = self.ring.window(ticker)
+        for _ in range(evicted):
+            self._count("eviction")
+        return df
+
+    # 패스를 시작할 때: 지난 패스에서 내보낸 종목의 링 행을 다시 쓸 수 있게 한다
+    def recycle(self):
+        with self.lock:
+            self.ring.recycle()
+
+    # 스냅샷 복원: 배열을 링에 바로 쓴다 (values 는 COLUMNS 순서의 2차원 배열)
+    def restore(self, ticker, times, values, refreshed):
+        with self.lock:
+            self.ring.write_arrays(ticker, times, values, reset=True)
+            self.entries[ticker] = refreshed
+            self.entries.move_to_end(ticker)
+
+    # 진행 중인 요청이 있으면 그 Future 를, 없으면 새로 등록하고 (Future, True) 를 돌려준다
+    def _claim(self, ticker):
+        with self.lock:
+            future = self.loading.get(ticker)
+            if future is not None:
+                return future, False
+            future = self.loading[ticker] = Future()
+            return future, True
+
+    def _settle(self, ticker, future, df=None, error=None):
+        with self.lock:
+            if self.loading.get(ticker) is future:
+                del self.loading[ticker]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(df)
+
+    # 스레드에서 부른다 (이벤트 루프 스레드에서 부르면 그 루프의 요청을 기다리다 멈출 수 있다)
+    def get(self, ticker):
+        df = self.fresh(ticker)
+        if df is not None:
+            return df
+        future, owner = self._claim(ticker)
+        if not owner:
+            self._count("coalesced")
+            return future.result()
+        try:
+            df = self._load(ticker)
+        except BaseException as e:
+            self._settle(ticker, future, error=e)
+            raise
+        self._settle(ticker, future, df)
+        return df
+
+    def _load(self, ticker):
+        entry = self.lookup(ticker)
+        old = entry['df'] if entry else None
+        count = self.missing_count(old)
+        merged = self.merge(ticker, old, exchange.get_ohlcv(ticker, self.interval, count), count)
+        if merged is None:
+            # 이어 붙일 수 없으면 전체 이력을 새로 받는다
+            count = self.history
+            merged = self.merge(ticker, None, exchange.get_ohlcv(ticker, self.interval, count), count)
+        return merged if merged is not None else old
+
+    async def aget(self, ticker, priority=PRIORITY_NORMAL):
+        df = self.fresh(ticker)
+        if df is not None:
+            return df
+        future, owner = self._claim(ticker)
+        if owner:
+            task = asyncio.get_running_loop().create_task(self._aload(ticker, priority, future))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+        else:
+            self._count("coalesced")
+        # 기다리던 쪽이 취소돼도 요청은 끝까지 간다
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    async def _aload(self, ticker, priority, future):
+        try:
+            entry = self.lookup(ticker)
+            old = entry['df'] if entry else None
+            count = self.missing_count(old)
+            new = await exchange.aget_ohlcv(ticker, self.interval, count, priority=priority)
+            merged = self.merge(ticker, old, new, count)
+            if merged is None:
+                count = self.history
+                new = await exchange.aget_ohlcv(ticker, self.interval, count, priority=priority)
+                merged = self.merge(ticker, None, new, count)
+        except BaseException as e:
+            self._settle(ticker, future, error=e)
+            if not isinstance(e, Exception):
+                raise
+            return
+        self._settle(ticker, future, merged if merged is not None else old)
@@ -0,0 +1,172 @@
+import asyncio
+import exchange, indicators, telegram
+from candle_store import CandleStore
+from events import EventIndex
+from scheduler import Scheduler
+from snapshot import load_snapshot, save_snapshot
+from resample import Timeframes, can_derive, base_history
+from price_snapshot import take_snapshot_async
+from stream import stream_tickers
+from ratelimit import PRIORITY_NORMAL
+from metrics import INDICATOR_SECONDS, CHECK_SECONDS, PASS_SECONDS, SILENT_FAILURES
+
+# ⚙️ 통합 스캔 엔진: 캔들 저장소, 가격 스냅샷, 지표를 한 번만 만들고 모든 전략이 같이 쓴다
+HISTORY = 200           # 전략 중 가장 긴 이력 (지지 전략이 200일을 본다)
+TTL_SECONDS = 3000      # 정각 패스마다 다시 받도록 보고 주기보다 조금 짧게
+MAX_CACHE_SIZE = 300
+REPORT_INTERVAL = "minute60"    # 보고서는 매 정각
+EVENTS_PATH = "signal_events.json"
+SNAPSHOT_PATH = "candle_snapshot.bin"
+
+# 기본 주기 캔들 저장소 (이력 길이는 전략 주기 기준 HISTORY 봉을 만들 수 있을 만큼)
+def store_history(interval="day", base=None):
+    base = base or interval
+    return base_history(HISTORY + 1, interval, base) if base != interval else HISTORY
+
+def make_store(interval="day", base=None):
+    return CandleStore(history=store_history(interval, base), interval=base or interval,
+                       max_age=TTL_SECONDS, max_size=MAX_CACHE_SIZE)
+
+# 한 패스에서 모든 전략이 함께 보는 데이터
+class ScanContext:
+    def __init__(self, tickers, frames, snapshot, engine=None):
+        self.tickers = tickers
+        self.frames = frames
+        self.snapshot = snapshot
+        self.engine = engine
+        self.names = list(frames)   # 행렬 행 순서
+        self.rows = {t: i for i, t in enumerate(self.names)}
+        with INDICATOR_SECONDS.time(stage="bands"):
+            self.close = indicators.stack_field([frames[t] for t in self.names], 'close')
+            self.bands = indicators.compute_bands(self.close)
+
+    # 종목 하나의 지표 열을 그 종목 DataFrame 길이에 맞춰 돌려준다
+    def band(self, ticker, name):
+        return self.bands[name][self.rows[ticker], -len(self.frames[ticker]):]
+
+    # 같은 기본 캔들에서 만든 다른 주기 봉 (만들 수 없으면 None)
+    def candles(self, ticker, interval):
+        return self.engine.candles(ticker, interval) if self.engine is not None else None
+
+# 전략은 scan(ctx, engine) 으로 보고서 문자열(없으면 None)을 돌려주고,
+# 실시간 모드를 지원하면 on_tick(msg, engine) 으로 즉시 보낼 알림 목록을 돌려준다
+class ScanEngine:
+    # base 를 주면 그 주기 캔들 하나만 받아 interval 봉을 직접 만든다 (store 를 넘기면 여러 엔진이 공유)
+    # 넘겨받은 store 의 스냅샷은 만든 쪽이 읽고 쓴다
+    def __init__(self, strategies, fiat="KRW", events_path=EVENTS_PATH, interval="day", base=None, store=None,
+                 snapshot_path=SNAPSHOT_PATH):
+        self.strategies = strategies
+        self.fiat = fiat
+        self.interval = interval
+        self.base = base or interval
+        self.store = store or make_store(interval, self.base)
+        self.timeframes = Timeframes(self.base)
+        self.events = EventIndex(events_path)   # 마감 봉 돌파 기록 (events_path=None 이면 메모리에만)
+        self.snapshot_path = snapshot_path if store is None else None
+        self.tickers = load_snapshot(self.snapshot_path, self.store)
+
+    async def get_frame(self, ticker, priority=PRIORITY_NORMAL):
+        # TTL 이 지나면 전체가 아니라 마지막 봉 이후만 받아 갱신한다
+        try:
+            df = await self.store.aget(ticker, priority)
+            return self.timeframes.get(ticker, df, self.interval)
+        except Exception:
+            SILENT_FAILURES.inc(where="candles")
+            return None
+
+    def candles(self, ticker, interval):
+        entry = self.store.lookup(ticker)
+        if entry is None or not can_derive(self.base, interval):
+            return None
+        return self.timeframes.get(ticker, entry['df'], interval)
+
+    # 요청 한도 안에서 최대한 병렬로 받는다 (순서는 exchange 스케줄러의 우선순위대로)
+    async def load_frames(self, tickers, priority=PRIORITY_NORMAL):
+        frames = await asyncio.gather(*(self.get_frame(t, priority) for t in tickers))
+        return {t: df for t, df in zip(tickers, frames) if df is not None}
+
+    async def refresh_tickers(self):
+        try:
+            self.tickers = await exchange.aget_tickers(fiat=self.fiat)
+        except Exception as e:
+            SILENT_FAILURES.inc(where="tickers")
+            print(f"❌ 종목 목록 조회 실패 (이전 목록 사용): {e}")
+        return self.tickers
+
+    # tickers 를 주면 종목 목록 조회를 건너뛴다 (샤드는 나눠 받은 목록만 본다)
+    async def build_context(self, priority=PRIORITY_NORMAL, tickers=None):
+        if tickers is None:
+            tickers = await self.refresh_tickers()
+        self.store.recycle()
+        frames, snapshot = await asyncio.gather(
+            self.load_frames(tickers, priority), take_snapshot_async(tickers))
+        return ScanContext(tickers, frames, snapshot, self)
+
+    # 기록, 보고, 스냅샷을 한 번에 (스케줄러 없이 한 패스만 돌릴 때)
+    async def run_pass(self, priority=PRIORITY_NORMAL):
+        with PASS_SECONDS.time():
+            ctx = await self.build_context(priority)
+            self.record_events(ctx)
+            await self.report(ctx)
+            save_snapshot(self.snapshot_path, self.store, self.tickers)
+        return ctx
+
+    async def report(self, ctx):
+        for strategy in self.strategies:
+            name = type(strategy).__name__
+            try:
+                with CHECK_SECONDS.time(strategy=name):
+                    report = await strategy.scan(ctx, self)
+            except Exception as e:
+                SILENT_FAILURES.inc(where=name)
+                print(f"❌ {name} 스캔 오류: {e}")
+                continue
+            if report:
+                telegram.enqueue(report)
+
+    def record_events(self, ctx):
+        with INDICATOR_SECONDS.time(stage="events"):
+            self.events.record(ctx.names, ctx.frames, ctx.close, ctx.bands)
+
+    # 보고서 대신 전략별 중간 결과만 (샤드 작업자용, 실패한 전략은 None)
+    async def collect(self, tickers, priority=PRIORITY_NORMAL):
+        with PASS_SECONDS.time():
+            ctx = await self.build_context(priority, tickers)
+            self.record_events(ctx)
+            parts = []
+            for strategy in self.strategies:
+                name = type(strategy).__name__
+                try:
+                    with CHECK_SECONDS.time(strategy=name):
+                        parts.append(strategy.collect(ctx, self))
+                except Exception as e:
+                    SILENT_FAILURES.inc(where=name)
+                    print(f"❌ {name} 스캔 오류: {e}")
+                    parts.append(None)
+        return parts
+
+    async def stream(self, tickers):
+        handlers = [s for s in self.strategies if hasattr(s, 'on_tick')]
+
+        def on_ticker(msg):
+            for strategy in handlers:
+                for alert in strategy.on_tick(msg, self) or ():
+                    telegram.enqueue(alert)
+
+        await stream_tickers(tickers, on_ticker)
+
+    # 매 정각 패스에서 마감 봉 기록 후 보고서. 기록은 색인의 through 이후 봉만 보므로 매번 해도 가볍고,
+    # 마감 직후 패스에서 빠진 종목(조회 실패, 새 봉 미생성)도 다음 정각에 바로 채운다
+    async def run(self, stream=False):
+        scheduler = Scheduler(self.build_context)
+        scheduler.add("events", REPORT_INTERVAL, self.record_events)
+        scheduler.add("report", REPORT_INTERVAL, self.report)
+        stream_task = None
+
+        def on_pass(ctx):
+            nonlocal stream_task
+            save_snapshot(self.snapshot_path, self.store, self.tickers)
+            if stream and stream_task is None:
+                stream_task = asyncio.create_task(self.stream(ctx.tickers))
+
+        await scheduler.run(on_pass)
@@ -0,0 +1,125 @@
+import bisect, json, os
+from datetime import timedelta
+import numpy as np
+import pandas as pd
+import indicators
+
+# 📒 돌파 이벤트 색인: 봉이 마감될 때 한 번만 기록하고 파일에 남긴다
+# "최근 N일 안에 돌파한 종목과 그 시각" 을 이력을 다시 훑지 않고 색인에서 바로 찾는다
+# 종류는 indicators.CONDITIONS (BBD 는 지지 전략의 MA7 & BBD 동시 돌파와 같은 규칙)
+# 봉 시각(캔들 인덱스와 같은 KST 표기)을 키로 쓰므로 일봉 외 주기에도 그대로 쓴다
+KEEP_DAYS = 120         # 이보다 오래된 이벤트는 버린다 (조회 기간 상한)
+
+class Event:
+    __slots__ = ('candle', 'ticker', 'kind', 'close')
+
+    def __init__(self, candle, ticker, kind, close):
+        self.candle = candle
+        self.ticker = ticker
+        self.kind = kind
+        self.close = close
+
+class EventIndex:
+    def __init__(self, path=None, keep_days=KEEP_DAYS):
+        self.path = path
+        self.keep_days = keep_days
+        self.reset()
+        self.load()
+
+    def reset(self):
+        self.events = {}        # (candle, ticker, kind) -> Event
+        self.by_candle = {}     # candle -> {ticker: [Event]}
+        self.by_ticker = {}     # ticker -> [Event] (시각순)
+        self.through = {}       # ticker -> 기록을 마친 마지막 마감 봉 시각
+
+    def add(self, candle, ticker, kind, close):
+        key = (candle, ticker, kind)
+        if key in self.events:
+            return False
+        event = Event(candle, ticker, kind, close)
+        self.events[key] = event
+        self.by_candle.setdefault(candle, {}).setdefault(ticker, []).append(event)
+        bisect.insort(self.by_ticker.setdefault(ticker, []), event, key=lambda e: e.candle)
+        return True
+
+    # 그 봉에 이벤트가 있는 종목들
+    def on(self, candle):
+        return self.by_candle.get(candle, {})
+
+    # start <= 봉 시각 <= end 중 가장 최근 이벤트 (없으면 None)
+    def last(self, ticker, kind, start, end):
+        events = self.by_ticker.get(ticker, [])
+        for event in reversed(events[:bisect.bisect_right(events, end, key=lambda e: e.candle)]):
+            if event.candle < start:
+                break
+            if event.kind == kind:
+                return event
+        return None
+
+    # 엔진이 계산해 둔 밴드 행렬로 새로 마감된 봉만 확인 (종목마다 진행 중인 마지막 봉 제외)
+    def record(self, names, frames, close, bands):
+        masks = indicators.crossover_history(close, bands)
+        width = close.shape[1]
+        added = 0
+        changed = False
+        for row, ticker in enumerate(names):
+            df = frames[ticker]
+            closed = df.index[:-1]
+            if len(closed) == 0:
+                continue
+            last = self.through.get(ticker)
+            start = closed.searchsorted(last, side='right') if last is not None else 0
+            if start >= len(closed):
+                continue
+            offset = width - len(df)
+            for kind in indicators.CONDITIONS:
+                for j in np.flatnonzero(masks[kind][row, offset + start:offset + len(closed)]):
+                    pos = start + j
+                    added += self.add(closed[pos], ticker, kind, float(close[row, offset + pos]))
+            self.through[ticker] = closed[-1]
+            changed = True
+        if changed:
+            self.prune(max(self.through.values()) - timedelta(days=self.keep_days))
+            self.save()
+        return added
+
+    def prune(self, before):
+        for candle in [c for c in self.by_candle if c < before]:
+            for ticker, events in self.by_candle.pop(candle).items():
+                for event in events:
+                    del self.events[(candle, ticker, event.kind)]
+                kept = [e for e in self.by_ticker[ticker] if e.candle >= before]
+                if kept:
+                    self.by_ticker[ticker] = kept
+                else:
+                    del self.by_ticker[ticker]
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            for candle, ticker, kind, close in data['events']:
+                self.add(pd.Timestamp(candle), ticker, kind, close)
+            self.through = {t: pd.Timestamp(c) for t, c in data['through'].items()}
+        except Exception as e:
+            print(f"❌ 이벤트 색인 읽기 실패 (처음부터 다시 기록): {e}")
+            self.reset()
+
+    # 임시 파일에 쓴 뒤 바꿔치기 (쓰다 죽어도 이전 파일은 남는다)
+    def save(self):
+        if not self.path:
+            return
+        data = {
+            'through': {t: c.isoformat() for t, c in self.through.items()},
+            'events': [[e.candle.isoformat(), e.ticker, e.kind, e.close]
+                       for e in sorted(self.events.values(), key=lambda e: (e.candle, e.ticker, e.kind))],
+        }
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"❌ 이벤트 색인 저장 실패: {e}")
@@ -0,0 +1,156 @@
+import asyncio, requests
+import pandas as pd
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from ratelimit import TokenBucket, FetchScheduler, backoff_delay, MAX_RETRIES, PRIORITY_NORMAL, PRIORITY_LIVE
+from metrics import FETCH_SECONDS, FETCH_ERRORS, RATE_LIMITED
+
+# 🔌 외부 API 공용 클라이언트 (Upbit / Bybit / Naver / Telegram)
+# keep-alive 세션 하나를 공유하고, asyncio 쪽은 전용 스레드풀에서 돌려 이벤트 루프를 막지 않는다
+UPBIT_API = "https://api.upbit.com/v1"
+MAX_CONCURRENCY = 8     # 동시에 나가는 요청 수 상한
+UPBIT_QUOTAS = {'market': 10, 'candle': 10, 'ticker': 10}  # Upbit 시세 API 그룹별 초당 요청 한도
+TIMEOUT = 10
+MAX_CANDLES = 200       # Upbit 캔들 API 한 번에 받을 수 있는 개수
+
+CANDLE_PATHS = {
+    "day": "/candles/days",
+    "week": "/candles/weeks",
+    "minute60": "/candles/minutes/60",
+    "minute240": "/candles/minutes/240",
+}
+
+session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_CONCURRENCY)
+session.mount("https://", _adapter)
+session.mount("http://", _adapter)
+
+_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENCY, thread_name_prefix="exchange")
+_limit = asyncio.Semaphore(MAX_CONCURRENCY)
+RATE_MARGIN = 0.9       # 서버 쪽 1초 창 경계에서 한도를 넘지 않도록 약간 낮춰 쓴다
+buckets = {group: TokenBucket(rate * RATE_MARGIN) for group, rate in UPBIT_QUOTAS.items()}
+scheduler = FetchScheduler(_executor, MAX_CONCURRENCY)
+
+SOURCES = {
+    "api.bybit.com": "bybit",
+    "finance.naver.com": "naver",
+    "api.telegram.org": "telegram",
+}
+
+# 지표 라벨용 요청 출처 이름
+def source_of(url):
+    host = urlparse(url).netloc
+    return SOURCES.get(host, host)
+
+# 🌐 동기 호출 (스레드 루프용)
+def _get(url, params=None):
+    source = source_of(url)
+    try:
+        with FETCH_SECONDS.time(source=source):
+            res = session.get(url, params=params, timeout=TIMEOUT)
+            res.raise_for_status()
+            return res
+    except Exception:
+        FETCH_ERRORS.inc(source=source)
+        raise
+
+def get_json(url, params=None):
+    return _get(url, params).json()
+
+def get_text(url, params=None):
+    return _get(url, params).text
+
+def post(url, data=None):
+    return session.post(url, data=data, timeout=TIMEOUT)
+
+# Upbit 요청은 그룹별 토큰을 받은 뒤에만 나가고, 429 는 버킷 전체를 늦춘 뒤 다시 시도한다
+# 걸린 시간은 토큰 대기와 재시도까지 포함한다
+def upbit_get(group, path, params=None):
+    source = f"upbit_{group}"
+    try:
+        with FETCH_SECONDS.time(source=source):
+            return _upbit_get(group, path, params)
+    except Exception:
+        FETCH_ERRORS.inc(source=source)
+        raise
+
+def _upbit_get(group, path, params):
+    bucket = buckets[group]
+    for attempt in range(MAX_RETRIES + 1):
+        bucket.acquire()
+        res = session.get(UPBIT_API + path, params=params, timeout=TIMEOUT)
+        if res.status_code != 429 or attempt == MAX_RETRIES:
+            res.raise_for_status()
+            return res.json()
+        RATE_LIMITED.inc(group=group)
+        delay = backoff_delay(attempt, res.headers.get('Retry-After'))
+        print(f"⏳ Upbit 요청 한도 초과 ({group}) - {delay:.1f}초 후 재시도")
+        bucket.pause(delay)
+
+def get_tickers(fiat="KRW"):
+    markets = upbit_get('market', "/market/all", {"isDetails": "false"})
+    return [m['market'] for m in markets if m['market'].startswith(fiat)]
+
+def get_current_price(tickers):
+    contents = upbit_get('ticker', "/ticker", {"markets": ",".join(tickers)})
+    return {x['market']: x['trade_price'] for x in contents}
+
+def _to_frame(contents):
+    index = pd.to_datetime([x['candle_date_time_kst'] for x in contents])
+    df = pd.DataFrame({
+        'open': [x['opening_price'] for x in contents],
+        'high': [x['high_price'] for x in contents],
+        'low': [x['low_price'] for x in contents],
+        'close': [x['trade_price'] for x in contents],
+        'volume': [x['candle_acc_trade_volume'] for x in contents],
+        'value': [x['candle_acc_trade_price'] for x in contents],
+    }, index=index)
+    df = df[~df.index.duplicated(keep='last')]
+    return df.sort_index()
+
+# pyupbit.get_ohlcv 와 같은 모양(KST 인덱스, open/high/low/close/volume/value)의 DataFrame
+def get_ohlcv(ticker, interval="day", count=200, to=None):
+    path = CANDLE_PATHS[interval]
+    contents = []
+    remaining = max(count, 1)
+    while remaining > 0:
+        params = {"market": ticker, "count": min(MAX_CANDLES, remaining)}
+        if to is not None:
+            params["to"] = to
+        page = upbit_get('candle', path, params)
+        if not page:
+            break
+        contents += page
+        remaining -= len(page)
+        to = page[-1]['candle_date_time_utc']  # 응답은 최신순
+        if len(page) < params["count"]:
+            break
+    if not contents:
+        return None
+    return _to_frame(contents)
+
+# ⚡ 비동기 호출 (asyncio 루프용)
+async def run(func, *args, **kwargs):
+    async with _limit:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, lambda: func(*args, **kwargs))
+
+async def aget_json(url, params=None):
+    return await run(get_json, url, params)
+
+async def aget_text(url, params=None):
+    return await run(get_text, url, params)
+
+async def apost(url, data=None):
+    return await run(post, url, data)
+
+# Upbit 요청은 우선순위 큐를 거쳐 나간다 (토큰 대기는 작업 스레드 안에서)
+async def aget_tickers(fiat="KRW", priority=PRIORITY_LIVE):
+    return await scheduler.submit(priority, get_tickers, fiat)
+
+async def aget_current_price(tickers, priority=PRIORITY_LIVE):
+    return await scheduler.submit(priority, get_current_price, tickers)
+
+async def aget_ohlcv(ticker, interval="day", count=200, to=None, priority=PRIORITY_NORMAL):
+    return await scheduler.submit(priority, get_ohlcv, ticker, interval, count, to)
@@ -0,0 +1,262 @@
+import gzip, json, random, threading, time
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from requests.adapters import HTTPAdapter
+import exchange
+
+# 🧪 로컬 외부 API 대역 (Upbit / Bybit / Naver / Telegram)
+# 기록해 둔 응답(fixture)을 지연을 넣어 돌려주고, 서비스별 요청 수를 센다
+# 사용: fake = FakeExchange(fixtures, latency=0.02).start(); fake.install(exchange.session)
+SERVICES = {
+    "https://api.upbit.com": "upbit",
+    "https://api.bybit.com": "bybit",
+    "https://finance.naver.com": "naver",
+    "https://api.telegram.org": "telegram",
+}
+CANDLE_FORMAT = "%Y-%m-%dT%H:%M:%S"
+INTERVAL_STEPS = {
+    "candles/days": timedelta(days=1),
+    "candles/minutes/60": timedelta(hours=1),
+}
+NAVER_HTML = """<div class="head_info"><span class="value">{today:,.2f}</span>
+<span class="change">{diff:.2f}</span><span class="blind">{direction}</span></div>"""
+
+# 📼 실제 응답 기록 (네트워크 필요). 캔들은 Upbit 응답 그대로(최신순) 저장한다
+def record_fixtures(path, tickers, days=200, hours=17):
+    candles = {p: {} for p in INTERVAL_STEPS}
+    for t in tickers:
+        candles["candles/days"][t] = _record_candles(t, "/candles/days", days)
+    candles["candles/minutes/60"]["KRW-BTC"] = _record_candles("KRW-BTC", "/candles/minutes/60", hours)
+    fixtures = {
+        'recorded_at': datetime.now(timezone.utc).strftime(CANDLE_FORMAT),
+        'candles': candles,
+        'bybit': exchange.get_json("https://api.bybit.com/v5/market/kline?category=linear&symbol=BTCUSDT&interval=D&limit=10"),
+        'naver': exchange.get_text("https://finance.naver.com/marketindex/"),
+    }
+    save_fixtures(path, fixtures)
+    return fixtures
+
+def _record_candles(ticker, path, count):
+    rows, to = [], None
+    while len(rows) < count:
+        params = {"market": ticker, "count": min(exchange.MAX_CANDLES, count - len(rows))}
+        if to:
+            params["to"] = to
+        page = exchange.upbit_get('candle', path, params)
+        if not page:
+            break
+        rows += page
+        to = page[-1]['candle_date_time_utc']
+    return rows
+
+def save_fixtures(path, fixtures):
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        json.dump(fixtures, f)
+
+def load_fixtures(path):
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+def _candle_rows(ticker, count, step, end, rnd, price):
+    rows = []
+    for i in range(count):
+        start = end - step * i
+        o = price
+        c = max(o * (1 + rnd.gauss(0, 0.04)), 1e-8)
+        rows.append({
+            'market': ticker,
+            'candle_date_time_utc': start.strftime(CANDLE_FORMAT),
+            'candle_date_time_kst': (start + timedelta(hours=9)).strftime(CANDLE_FORMAT),
+            'opening_price': o,
+            'high_price': max(o, c) * 1.01,
+            'low_price': min(o, c) * 0.99,
+            'trade_price': c,
+            'candle_acc_trade_volume': rnd.uniform(1e3, 1e6),
+            'candle_acc_trade_price': rnd.uniform(1e8, 1e11),
+        })
+        price = c
+    return rows
+
+# 🎲 기록이 없을 때 쓰는 가짜 응답 (같은 seed 면 같은 데이터)
+def synthetic_fixtures(count, days=200, hours=17, seed=0):
+    rnd = random.Random(seed)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    hour = now.replace(minute=0, second=0, microsecond=0)
+    tickers = ["KRW-BTC"] + [f"KRW-C{i:04d}" for i in range(count - 1)]
+    daily = {t: _candle_rows(t, days, timedelta(days=1), today, rnd, rnd.uniform(1, 1e5)) for t in tickers}
+    btc = daily["KRW-BTC"][0]['trade_price']
+    bybit = [[str(int((today - timedelta(days=i)).replace(tzinfo=timezone.utc).timestamp() * 1000)),
+              str(60000 * (1 + rnd.gauss(0, 0.02))), "0", "0", str(60000 * (1 + rnd.gauss(0, 0.02))), "0", "0"]
+             for i in range(10)]
+    usdkrw = rnd.uniform(1300, 1450)
+    return {
+        'recorded_at': now.strftime(CANDLE_FORMAT),
+        'candles': {
+            "candles/days": daily,
+            "candles/minutes/60": {"KRW-BTC": _candle_rows("KRW-BTC", hours, timedelta(hours=1), hour, rnd, btc)},
+        },
+        'bybit': {'retCode': 0, 'result': {'list': bybit}},
+        'naver': NAVER_HTML.format(today=usdkrw, diff=abs(rnd.gauss(0, 3)), direction="상승"),
+    }
+
+# 기록된 종목 수보다 많이 필요하면 기존 종목 이력을 다른 이름으로 복제해 늘린다
+def scale_fixtures(fixtures, count):
+    daily = fixtures['candles']["candles/days"]
+    names = list(daily)
+    scaled = {t: daily[t] for t in names[:count]}
+    for i in range(count - len(scaled)):
+        src = names[i % len(names)]
+        ticker = f"KRW-X{i:04d}"
+        scaled[ticker] = [dict(row, market=ticker) for row in daily[src]]
+    candles = dict(fixtures['candles'], **{"candles/days": scaled})
+    return dict(fixtures, candles=candles)
+
+# 기록 시점과 지금 사이의 일 수만큼 캔들/Bybit 시각을 앞으로 옮겨 "오늘" 데이터처럼 보이게 한다
+def rebase_fixtures(fixtures, now=None):
+    now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+    recorded = datetime.strptime(fixtures['recorded_at'], CANDLE_FORMAT)
+    delta = timedelta(days=(now.date() - recorded.date()).days)
+    if not delta:
+        return fixtures
+
+    def shift(text):
+        return (datetime.strptime(text, CANDLE_FORMAT) + delta).strftime(CANDLE_FORMAT)
+
+    candles = {
+        path: {t: [dict(r, candle_date_time_utc=shift(r['candle_date_time_utc']),
+                        candle_date_time_kst=shift(r['candle_date_time_kst'])) for r in rows]
+               for t, rows in by_ticker.items()}
+        for path, by_ticker in fixtures['candles'].items()
+    }
+    bybit = json.loads(json.dumps(fixtures['bybit']))
+    for kline in bybit.get('result', {}).get('list', []):
+        kline[0] = str(int(kline[0]) + int(delta.total_seconds() * 1000))
+    return dict(fixtures, candles=candles, bybit=bybit, recorded_at=now.strftime(CANDLE_FORMAT))
+
+class FakeExchange:
+    def __init__(self, fixtures, latency=0.0, host="127.0.0.1", port=0):
+        self.fixtures = fixtures
+        self.latency = latency      # 초, 또는 서비스별 dict ({'upbit': 0.03, ...})
+        self.host = host
+        self.port = port
+        self.requests = {name: 0 for name in SERVICES.values()}
+        self.sent = []              # 텔레그램으로 보낸 메시지
+        self.lock = threading.Lock()
+        self.server = None
+        self._mounted = {}
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def request_count(self):
+        return sum(self.requests.values())
+
+    def start(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # 머리와 본문을 따로 써도 지연 ACK 에 걸리지 않게
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                self._reply(*fake.handle('GET', self.path, None))
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                self._reply(*fake.handle('POST', self.path, self.rfile.read(length)))
+
+            def _reply(self, status, content_type, body):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    # 실제 주소로 나가는 요청을 이 서버로 돌린다 (코드 쪽 URL 은 그대로)
+    def install(self, session):
+        adapter = _RewriteAdapter(self, pool_maxsize=exchange.MAX_CONCURRENCY)
+        for prefix in SERVICES:
+            self._mounted[prefix] = session.adapters.get(prefix)
+            session.mount(prefix, adapter)
+        return self
+
+    def uninstall(self, session):
+        for prefix, previous in self._mounted.items():
+            if previous is None:
+                session.adapters.pop(prefix, None)
+            else:
+                session.mount(prefix, previous)
+        self._mounted = {}
+
+    def reset_counts(self):
+        with self.lock:
+            self.requests = {name: 0 for name in self.requests}
+            self.sent = []
+
+    def handle(self, method, path, body):
+        url = urlparse(path)
+        service, _, rest = url.path.lstrip('/').partition('/')
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        with self.lock:
+            self.requests[service] = self.requests.get(service, 0) + 1
+        delay = self.latency.get(service, 0) if isinstance(self.latency, dict) else self.latency
+        if delay:
+            time.sleep(delay)
+        if service == 'upbit':
+            return self._json(self.upbit(rest, query))
+        if service == 'bybit':
+            return self._json(self.fixtures['bybit'])
+        if service == 'naver':
+            return 200, 'text/html; charset=utf-8', self.fixtures['naver'].encode()
+        if service == 'telegram':
+            form = parse_qs(body.decode()) if body else {}
+            with self.lock:
+                self.sent.append(form.get('text', [""])[0])
+            return self._json({'ok': True})
+        return 404, 'application/json', b'{}'
+
+    def upbit(self, path, query):
+        daily = self.fixtures['candles']["candles/days"]
+        if path == "v1/market/all":
+            return [{'market': t} for t in daily]
+        if path == "v1/ticker":
+            return [{'market': t, 'trade_price': daily[t][0]['trade_price']}
+                    for t in query.get('markets', "").split(",") if t in daily]
+        rows = self.fixtures['candles'].get(path[len("v1/"):], {}).get(query.get('market'), [])
+        if 'to' in query:
+            to = query['to'].replace(" ", "T")
+            rows = [r for r in rows if r['candle_date_time_utc'] < to]
+        return rows[:int(query.get('count', 200))]
+
+    @staticmethod
+    def _json(data):
+        return 200, 'application/json', json.dumps(data).encode()
+
+class _RewriteAdapter(HTTPAdapter):
+    def __init__(self, fake, **kwargs):
+        self.fake = fake
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        for prefix, service in SERVICES.items():
+            if request.url.startswith(prefix):
+                request.url = f"{self.fake.url}/{service}{request.url[len(prefix):]}"
+                break
+        return super().send(request, **kwargs)
@@ -0,0 +1,69 @@
+import asyncio, json, time
+import websockets
+
+# 🧪 로컬 Upbit 웹소켓 대역: 구독을 받고 publish() 한 시세를 구독자에게 보낸다
+# 사용: feed = FakeTickerFeed(); await feed.start(); stream_tickers(codes, cb, url=feed.url)
+class FakeTickerFeed:
+    def __init__(self, host="127.0.0.1", port=0):
+        self.host = host
+        self.port = port
+        self.clients = {}       # ws -> 구독 종목 집합
+        self.subscriptions = 0  # 받은 구독 요청 수 (재접속 확인용)
+        self.server = None
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}"
+
+    async def start(self):
+        self.server = await websockets.serve(self._handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, ws):
+        try:
+            request = json.loads(await ws.recv())
+            codes = set()
+            for part in request:
+                if part.get('type') == 'ticker':
+                    codes.update(part.get('codes', []))
+            self.clients[ws] = codes
+            self.subscriptions += 1
+            await ws.wait_closed()
+        finally:
+            self.clients.pop(ws, None)
+
+    # Upbit 처럼 바이너리 프레임에 JSON 을 담아 보낸다
+    async def publish(self, code, price, opening_price=None, timestamp=None):
+        timestamp = timestamp or int(time.time() * 1000)
+        msg = json.dumps({
+            'type': 'ticker',
+            'code': code,
+            'trade_price': price,
+            'opening_price': opening_price if opening_price is not None else price,
+            'trade_timestamp': timestamp,
+            'timestamp': timestamp,
+            'stream_type': 'REALTIME',
+        }).encode()
+        for ws, codes in list(self.clients.items()):
+            if code in codes:
+                try:
+                    await ws.send(msg)
+                except websockets.ConnectionClosed:
+                    pass
+
+    # 접속 끊김 흉내 (클라이언트가 알아서 다시 붙는지 확인용)
+    async def drop_clients(self):
+        for ws in list(self.clients):
+            await ws.close()
+
+    async def wait_for_clients(self, count=1, timeout=5):
+        deadline = time.monotonic() + timeout
+        while len(self.clients) < count:
+            if time.monotonic() > deadline:
+                raise TimeoutError("구독자가 붙지 않음")
+            await asyncio.sleep(0.01)
@@ -0,0 +1,64 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# 📐 전 종목 지표 엔진: 종가를 (종목 × 일) 행렬 하나로 모아 한 번에 계산
+MA_SHORT = 7
+MA_LONG = 120
+BB_K = 2
+CONDITIONS = ["BBD", "MA", "BBU"]
+
+# 종목마다 길이가 다르면 오른쪽(최근) 기준으로 맞추고 앞은 NaN 으로 채운다
+def stack_field(frames, field='close', days=None):
+    days = days or max((len(df) for df in frames), default=0)
+    matrix = np.full((len(frames), days), np.nan)
+    for row, df in enumerate(frames):
+        values = df[field].to_numpy(dtype=float)[-days:]
+        if len(values):
+            matrix[row, -len(values):] = values
+    return matrix
+
+# 창 안에 NaN 이 하나라도 있으면 NaN (pandas rolling 과 같은 규칙)
+def rolling_mean(matrix, window):
+    out = np.full(matrix.shape, np.nan)
+    if matrix.shape[1] < window:
+        return out
+    windows = sliding_window_view(matrix, window, axis=1)
+    out[:, -windows.shape[1]:] = windows.mean(axis=-1)
+    return out
+
+def rolling_std(matrix, window):
+    out = np.full(matrix.shape, np.nan)
+    if matrix.shape[1] < window:
+        return out
+    windows = sliding_window_view(matrix, window, axis=1)
+    out[:, -windows.shape[1]:] = windows.std(axis=-1, ddof=1)
+    return out
+
+def compute_bands(close):
+    ma7 = rolling_mean(close, MA_SHORT)
+    ma120 = rolling_mean(close, MA_LONG)
+    std120 = rolling_std(close, MA_LONG)
+    return {
+        'MA7': ma7,
+        'MA120': ma120,
+        'STD120': std120,
+        'BBU': ma120 + BB_K * std120,
+        'BBD': ma120 - BB_K * std120,
+    }
+
+# 전일(p) 대비 당일(c) 돌파 규칙 세 가지. 배열 모양은 자유 (NaN 비교는 False)
+def crossover_rules(pc, cc, p, c):
+    with np.errstate(invalid='ignore'):
+        return {
+            "BBD": (pc < p['BBD']) & (pc < p['MA7']) & (cc > c['BBD']) & (cc > c['MA7']),
+            "MA": (pc < p['MA120']) & (pc < p['MA7']) & (cc > c['MA120']) & (cc > c['MA7']),
+            "BBU": (pc < p['BBU']) & (cc > c['BBU']),
+        }
+
+# 전체 이력의 모든 날에 대해 같은 규칙 (첫날은 전일이 없으므로 False)
+def crossover_history(close, bands):
+    p = {k: v[:, :-1] for k, v in bands.items()}
+    c = {k: v[:, 1:] for k, v in bands.items()}
+    rules = crossover_rules(close[:, :-1], close[:, 1:], p, c)
+    pad = np.zeros((close.shape[0], 1), dtype=bool)
+    return {k: np.hstack([pad, v]) for k, v in rules.items()}
@@ -1,5 +1,6 @@
-from flask import Flask
+from flask import Flask, Response
 import threading
+import metrics
 
 app = Flask(__name__)
 
@@ -7,6 +8,10 @@ app = Flask(__name__)
 def home():
     return "I'm alive!"
 
+@app.route('/metrics')
+def prometheus_metrics():
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 def run():
     app.run(host='0.0.0.0', port=8080)
 
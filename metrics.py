@@ -0,0 +1,101 @@
+import math, threading, time
+from contextlib import contextmanager
+
+# 📏 Prometheus 텍스트 형식 지표 (keep_alive 의 /metrics 에서 내보낸다)
+# 외부 라이브러리 없이 카운터와 히스토그램만. 라벨 조합마다 값을 따로 들고 있다
+FAST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SLOW_BUCKETS = (0.5, 1, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+_registry = []
+_lock = threading.Lock()
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _label_text(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+def _number(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.values = {}
+        _registry.append(self)
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(n, "") for n in self.labels)
+        with _lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{_label_text(self.labels, key)} {_number(value)}")
+        return lines
+
+class Histogram:
+    def __init__(self, name, help, labels=(), buckets=FAST_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets) + (math.inf,)
+        self.values = {}    # 라벨 -> [구간별 개수..., 합계, 개수]
+        _registry.append(self)
+
+    def observe(self, seconds, **labels):
+        key = tuple(labels.get(n, "") for n in self.labels)
+        with _lock:
+            row = self.values.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    row[i] += 1
+            row[-2] += seconds
+            row[-1] += 1
+
+    # with HIST.time(source="upbit"): ...  (async 블록 안에서도 그대로 쓴다)
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, row in sorted(self.values.items()):
+            for bound, count in zip(self.buckets, row):
+                lines.append(f"{self.name}_bucket{_label_text(self.labels, key, [('le', _number(bound))])} {count}")
+            lines.append(f"{self.name}_sum{_label_text(self.labels, key)} {_number(row[-2])}")
+            lines.append(f"{self.name}_count{_label_text(self.labels, key)} {row[-1]}")
+        return lines
+
+def render():
+    with _lock:
+        lines = [line for metric in _registry for line in metric.render()]
+    return "\n".join(lines) + "\n"
+
+# 🔌 외부 요청
+FETCH_SECONDS = Histogram("mct_fetch_seconds", "외부 API 요청 시간 (재시도 포함)", ["source"])
+FETCH_ERRORS = Counter("mct_fetch_errors_total", "실패한 외부 API 요청 수", ["source"])
+RATE_LIMITED = Counter("mct_rate_limited_total", "Upbit 429 응답 수", ["group"])
+# 🧮 지표 / 조건 확인
+INDICATOR_SECONDS = Histogram("mct_indicator_seconds", "지표 계산 시간", ["stage"])
+CHECK_SECONDS = Histogram("mct_check_seconds", "전략별 조건 확인/보고서 작성 시간", ["strategy"])
+PASS_SECONDS = Histogram("mct_pass_seconds", "스캔 패스 전체 시간", buckets=SLOW_BUCKETS)
+# 📤 전송
+SEND_SECONDS = Histogram("mct_send_seconds", "텔레그램 전송 시간 (시도 한 번)")
+SEND_RETRIES = Counter("mct_send_retries_total", "텔레그램 재전송 횟수")
+# 🕯️ 캔들 캐시
+CACHE_EVENTS = Counter("mct_cache_events_total", "캔들 캐시 적중/실패/밀어내기", ["cache", "event"])
+# 🤫 예외를 잡고 계속 진행한 곳 (기본값/이전 값으로 대체)
+SILENT_FAILURES = Counter("mct_silent_failures_total", "잡고 넘어간 예외 수", ["where"])
@@ -0,0 +1,36 @@
+import asyncio, time
+import exchange
+from metrics import SILENT_FAILURES
+
+# 📸 가격 스냅샷: 전 종목 현재가를 묶음 요청 몇 번으로 한 번에 조회
+SNAPSHOT_CHUNK = 100  # 요청당 종목 수 (URL 길이 여유)
+
+class PriceSnapshot:
+    def __init__(self, prices, taken_at):
+        self.prices = prices
+        self.taken_at = taken_at
+
+    def get(self, ticker, default=None):
+        return self.prices.get(ticker, default)
+
+    def __contains__(self, ticker):
+        return ticker in self.prices
+
+    def __len__(self):
+        return len(self.prices)
+
+def _chunks(tickers):
+    tickers = list(tickers)
+    return [tickers[i:i + SNAPSHOT_CHUNK] for i in range(0, len(tickers), SNAPSHOT_CHUNK)]
+
+async def take_snapshot_async(tickers):
+    chunks = _chunks(tickers)
+    results = await asyncio.gather(*(exchange.aget_current_price(c) for c in chunks), return_exceptions=True)
+    prices = {}
+    for chunk, result in zip(chunks, results):
+        if isinstance(result, Exception):
+            SILENT_FAILURES.inc(where="snapshot")
+            print(f"❌ 가격 스냅샷 오류 ({chunk[0]} 외 {len(chunk) - 1}종목): {result}")
+        else:
+            prices.update(result)
+    return PriceSnapshot(prices, time.time())
@@ -0,0 +1,88 @@
+import asyncio, itertools, threading, time
+
+# ⏳ 요청 한도 관리: 그룹별 토큰 버킷 + 우선순위 작업 큐
+MAX_RETRIES = 5
+BASE_BACKOFF = 0.5
+MAX_BACKOFF = 10
+
+# 우선순위 (작을수록 먼저)
+PRIORITY_LIVE = 0      # 현재가 스냅샷, BTC 요약 등 바로 보낼 데이터
+PRIORITY_NORMAL = 1    # 정시 스캔용 캔들 갱신
+
+# 토큰은 미리 예약해서 음수까지 내려갈 수 있다. 예약한 순서대로 간격을 두고 나가게 된다
+class TokenBucket:
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    # 토큰 n개를 쓰기 전까지 기다려야 하는 시간(초)
+    def reserve(self, n=1):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= n
+            return max(0.0, -self.tokens / self.rate)
+
+    def acquire(self, n=1):
+        wait = self.reserve(n)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, n=1):
+        wait = self.reserve(n)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    # 429 를 받으면 이후 예약 전체를 seconds 만큼 뒤로 민다
+    def pause(self, seconds):
+        with self.lock:
+            self.tokens = min(self.tokens, 0) - seconds * self.rate
+
+def backoff_delay(attempt, retry_after=None):
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    return min(BASE_BACKOFF * 2 ** attempt, MAX_BACKOFF)
+
+# asyncio 쪽 작업 큐: 우선순위 순서로 꺼내 workers 개까지만 동시에 스레드풀에서 실행
+class FetchScheduler:
+    def __init__(self, executor, workers):
+        self.executor = executor
+        self.workers = workers
+        self.queue = None
+        self.loop = None
+        self.seq = itertools.count()  # 같은 우선순위는 들어온 순서대로
+
+    # 작업자는 처음 쓰는 이벤트 루프에 붙인다 (루프가 바뀌면 다시 만든다)
+    def _start(self):
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.PriorityQueue()
+        for _ in range(self.workers):
+            self.loop.create_task(self._worker())
+
+    async def submit(self, priority, func, *args):
+        if self.loop is not asyncio.get_running_loop():
+            self._start()
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((priority, next(self.seq), func, args, future))
+        return await future
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            _, _, func, args, future = await self.queue.get()
+            if future.cancelled():
+                continue
+            try:
+                result = await loop.run_in_executor(self.executor, func, *args)
+                if not future.done():
+                    future.set_result(result)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
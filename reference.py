@@ -0,0 +1,52 @@
+import asyncio, time
+from metrics import SILENT_FAILURES
+
+# 📚 참조 데이터 캐시: 출처별 TTL, 동시에 한 번만 받기, 실패하면 마지막으로 받은 값
+_MISSING = object()
+
+class Source:
+    def __init__(self, name, fetch, ttl, default=_MISSING):
+        self.name = name
+        self.fetch = fetch          # 인자 없는 async 함수
+        self.ttl = ttl
+        self.default = default      # 한 번도 받지 못했을 때 쓸 값 (없으면 예외)
+        self.value = _MISSING
+        self.fetched_at = 0.0
+        self.pending = None         # 진행 중인 요청 (같이 기다린다)
+
+    def fresh(self):
+        return self.value is not _MISSING and time.monotonic() - self.fetched_at < self.ttl
+
+    async def get(self):
+        if self.fresh():
+            return self.value
+        loop = asyncio.get_running_loop()
+        if self.pending is None or self.pending.done() or self.pending.get_loop() is not loop:
+            self.pending = loop.create_task(self._refresh())
+        return await asyncio.shield(self.pending)
+
+    async def _refresh(self):
+        try:
+            value = await self.fetch()
+        except Exception as e:
+            SILENT_FAILURES.inc(where=self.name)
+            if self.value is not _MISSING:
+                print(f"❌ {self.name} 조회 실패 (마지막 값 사용): {e}")
+                return self.value
+            if self.default is not _MISSING:
+                print(f"❌ {self.name} 조회 실패 (기본값 사용): {e}")
+                return self.default
+            raise
+        self.value = value
+        self.fetched_at = time.monotonic()
+        return value
+
+class ReferenceData:
+    def __init__(self):
+        self.sources = {}
+
+    def add(self, name, fetch, ttl, default=_MISSING):
+        self.sources[name] = Source(name, fetch, ttl, default)
+
+    async def get(self, name):
+        return await self.sources[name].get()
@@ -0,0 +1,72 @@
+import pandas as pd
+from candle_store import COLUMNS, INTERVAL_SECONDS, freeze
+
+# 🔁 한 가지 기본 캔들(예: 시간봉)에서 4시간봉 / 일봉 / 주봉을 직접 만든다 (추가 요청 없음)
+# 인덱스는 Upbit 와 같은 KST 표기. align="UTC" 면 Upbit 와 같은 경계(일봉 09:00, 4시간봉 01·05·09시 ...,
+# 주봉 월요일 09:00), align="KST" 면 한국 시각 자정 기준 경계
+KST_OFFSET = pd.Timedelta(hours=9)
+FREQS = {
+    "minute60": "1h",
+    "minute240": "4h",
+    "day": "1D",
+}
+AGG = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum', 'value': 'sum'}
+
+# 각 시각이 속한 봉의 시작 시각
+def bin_start(index, interval, align="UTC"):
+    shift = KST_OFFSET if align == "UTC" else pd.Timedelta(0)
+    t = index - shift
+    if interval == "week":
+        day = t.floor("1D")
+        start = day - pd.to_timedelta(day.dayofweek, unit="D")
+    else:
+        start = t.floor(FREQS[interval])
+    return start + shift
+
+# 기본 주기보다 긴 주기만 만들 수 있다
+def can_derive(base, interval):
+    return INTERVAL_SECONDS[interval] >= INTERVAL_SECONDS[base] and INTERVAL_SECONDS[interval] % INTERVAL_SECONDS[base] == 0
+
+def resample(df, interval, align="UTC"):
+    if df is None or len(df) == 0:
+        return df
+    out = df[COLUMNS].groupby(bin_start(df.index, interval, align)).agg(AGG)
+    out.index.name = None
+    return out
+
+# 종목별로 만든 결과를 기억해 두고, 기본 캔들이 바뀐 봉부터만 다시 만든다
+# 돌려줄 때는 같은 배열 위에 DataFrame 을 새로 씌운다 (받은 쪽이 붙인 열이 캐시에 남지 않게)
+class Timeframes:
+    def __init__(self, base, align="UTC"):
+        self.base = base
+        self.align = align
+        self.cache = {}     # (ticker, interval) -> (기본 캔들 첫·마지막 시각, 만든 DataFrame)
+
+    def get(self, ticker, base_df, interval):
+        if interval == self.base or base_df is None or len(base_df) == 0:
+            return base_df
+        if not can_derive(self.base, interval):
+            raise ValueError(f"{self.base} 에서 {interval} 을 만들 수 없음")
+        key = (ticker, interval)
+        cached = self.cache.get(key)
+        first = bin_start(base_df.index[:1], interval, self.align)[0]
+        # 창이 앞으로만 밀렸을 때만 이어서 만든다 (다시 받아 더 길어졌으면 처음부터)
+        if cached is None or base_df.index[0] < cached[0] or cached[1] not in base_df.index:
+            out = resample(base_df, interval, self.align)
+        else:
+            # 지난번 마지막 봉(진행 중이었던 봉)이 속한 구간부터 다시 묶는다
+            since = bin_start(pd.DatetimeIndex([cached[1]]), interval, self.align)[0]
+            old = cached[2]
+            out = pd.concat([old[old.index < since], resample(base_df[base_df.index >= since], interval, self.align)])
+        # 기본 캔들 창 앞쪽에 걸친 봉은 일부만 들어 있으므로 버린다
+        if base_df.index[0] != first:
+            out = out[out.index > first]
+        else:
+            out = out[out.index >= first]
+        out = freeze(out)
+        self.cache[key] = (base_df.index[0], base_df.index[-1], out)
+        return freeze(out)
+
+# 기본 주기 봉 개수로 환산한 이력 길이
+def base_history(history, interval, base):
+    return history * INTERVAL_SECONDS[interval] // INTERVAL_SECONDS[base]
@@ -0,0 +1,155 @@
+import math
+import indicators
+
+# 🔁 O(1) 이동 지표: 링 버퍼 창마다 합계와 제곱합을 들고 다니며 값이 들어올 때만 갱신
+# 합계는 창 평균 근처(shift)를 기준으로 쌓아 큰 가격에서도 분산 계산이 무너지지 않게 하고,
+# size 번 갱신할 때마다 버퍼에서 다시 계산해 누적 오차를 지운다
+class RollingWindow:
+    __slots__ = ('size', 'buf', 'pos', 'count', 'shift', 'total', 'total_sq', 'ops')
+
+    def __init__(self, size, values=()):
+        self.size = size
+        self.buf = [0.0] * size
+        self.pos = 0        # 다음에 쓸 자리
+        self.count = 0
+        self.shift = 0.0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.ops = 0
+        for v in list(values)[-size:]:
+            self.push(v)
+
+    def _add(self, x):
+        d = x - self.shift
+        self.total += d
+        self.total_sq += d * d
+
+    def _remove(self, x):
+        d = x - self.shift
+        self.total -= d
+        self.total_sq -= d * d
+
+    def _tick(self):
+        self.ops += 1
+        if self.ops >= self.size:
+            self.resync()
+
+    def resync(self):
+        values = self.values()
+        self.shift = sum(values) / len(values) if values else 0.0
+        self.total = self.total_sq = 0.0
+        for v in values:
+            self._add(v)
+        self.ops = 0
+
+    # 새 캔들: 가장 오래된 값을 밀어내고 추가
+    def push(self, x):
+        x = float(x)
+        if self.count == self.size:
+            self._remove(self.buf[self.pos])
+        else:
+            self.count += 1
+        if self.count == 1:
+            self.shift = x
+        self.buf[self.pos] = x
+        self._add(x)
+        self.pos = (self.pos + 1) % self.size
+        self._tick()
+
+    # 진행 중인 캔들의 가격 변경: 마지막 값만 교체
+    def replace_last(self, x):
+        x = float(x)
+        last = (self.pos - 1) % self.size
+        self._remove(self.buf[last])
+        self.buf[last] = x
+        self._add(x)
+        self._tick()
+
+    def values(self):
+        if self.count < self.size:
+            return self.buf[:self.count]
+        return self.buf[self.pos:] + self.buf[:self.pos]
+
+    def last(self):
+        return self.buf[(self.pos - 1) % self.size] if self.count else math.nan
+
+    # 창이 다 차기 전에는 NaN (pandas rolling 과 같은 규칙)
+    def mean(self):
+        if self.count < self.size:
+            return math.nan
+        return self.shift + self.total / self.size
+
+    def std(self):
+        if self.count < self.size or self.size < 2:
+            return math.nan
+        n = self.size
+        var = (self.total_sq - self.total * self.total / n) / (n - 1)
+        return math.sqrt(var) if var > 0 else 0.0
+
+# 종목 하나의 MA7 / MA120 / 볼린저 밴드 상태
+class BandState:
+    __slots__ = ('short', 'long', 'last_time', 'prev_close', 'prev_bands')
+
+    def __init__(self, closes, last_time=None):
+        closes = [float(c) for c in closes]
+        # 전일 밴드는 전일 캔들까지로 계산해 고정해 둔다
+        self.short = RollingWindow(indicators.MA_SHORT, closes[:-1])
+        self.long = RollingWindow(indicators.MA_LONG, closes[:-1])
+        self.prev_close = closes[-2] if len(closes) >= 2 else math.nan
+        self.prev_bands = self.bands()
+        self.short.push(closes[-1])
+        self.long.push(closes[-1])
+        self.last_time = last_time
+
+    @classmethod
+    def from_frame(cls, df):
+        return cls(df['close'].to_numpy()[-(indicators.MA_LONG + 1):], df.index[-1])
+
+    def bands(self):
+        ma7 = self.short.mean()
+        ma120 = self.long.mean()
+        std120 = self.long.std()
+        return {
+            'MA7': ma7,
+            'MA120': ma120,
+            'STD120': std120,
+            'BBU': ma120 + indicators.BB_K * std120,
+            'BBD': ma120 - indicators.BB_K * std120,
+        }
+
+    # 실시간 가격: 진행 중인 캔들의 종가만 바꾼다
+    def update(self, close):
+        self.short.replace_last(close)
+        self.long.replace_last(close)
+
+    # 캔들 마감: 현재 밴드를 전일 밴드로 고정하고 새 캔들을 연다
+    def roll(self, close, candle_time=None):
+        self.prev_close = self.long.last()
+        self.prev_bands = self.bands()
+        self.short.push(close)
+        self.long.push(close)
+        self.last_time = candle_time
+
+    # 캐시된 일봉과 맞춘다. 같은 봉이면 종가 교체, 한 봉 앞서 있으면 마감 후 이동, 그 외에는 다시 만든다
+    def sync(self, df):
+        if len(df) >= 1 and df.index[-1] == self.last_time:
+            self.update(df['close'].iat[-1])
+            return self
+        if len(df) >= 2 and df.index[-2] == self.last_time:
+            self.update(df['close'].iat[-2])
+            self.roll(df['close'].iat[-1], df.index[-1])
+            return self
+        return BandState.from_frame(df)
+
+    # D-day 돌파 조건 (indicators.crossover_rules 와 같은 규칙)
+    def crossed(self):
+        pc, cc = self.prev_close, self.long.last()
+        p, c = self.prev_bands, self.bands()
+        hits = []
+        if pc < p['BBD'] and pc < p['MA7'] and cc > c['BBD'] and cc > c['MA7']:
+            hits.append("BBD")
+        if pc < p['MA120'] and pc < p['MA7'] and cc > c['MA120'] and cc > c['MA7']:
+            hits.append("MA")
+        if pc < p['BBU'] and cc > c['BBU']:
+            hits.append("BBU")
+        return hits
@@ -0,0 +1,68 @@
+import asyncio, inspect, time
+from candle_store import INTERVAL_SECONDS, candle_start
+from metrics import PASS_SECONDS, SILENT_FAILURES
+
+# ⏰ 중앙 스케줄러: 작업을 고정 간격 sleep 대신 벽시계 봉 경계(정각, 일봉 마감 등)에 맞춰 깨운다
+# 작업마다 자기 주기의 봉 하나에 정확히 한 번만 돈다 (실패하면 다음에 깨어날 때 다시)
+# 같이 깨어난 작업들은 prepare() 로 만든 데이터 패스 하나(캔들, 스냅샷, 지표)를 함께 쓴다
+SETTLE_SECONDS = 5      # 경계 직후 거래소에 새 봉이 생길 때까지 기다리는 시간
+
+class Job:
+    def __init__(self, name, interval, func):
+        self.name = name
+        self.interval = interval    # 봉 주기 이름 (minute60, day, ...)
+        self.func = func            # func(ctx), 일반 함수든 async 함수든
+        self.done = None            # 마지막으로 마친 봉의 시작 시각 (유닉스 초)
+
+    def period(self, now):
+        return candle_start(now, self.interval)
+
+class Scheduler:
+    def __init__(self, prepare=None, settle=SETTLE_SECONDS):
+        self.prepare = prepare      # async () -> ctx (없으면 작업에 None)
+        self.settle = settle
+        self.jobs = []
+
+    # 같은 시각에 깨어나면 추가한 순서대로 돈다
+    def add(self, name, interval, func):
+        self.jobs.append(Job(name, interval, func))
+
+    def due(self, now):
+        return [job for job in self.jobs if job.done != job.period(now)]
+
+    def next_wake(self, now):
+        return min(job.period(now) + INTERVAL_SECONDS[job.interval] for job in self.jobs)
+
+    # 이번 봉을 아직 안 한 작업만 한 패스로 돌린다 (할 일이 없으면 None)
+    async def tick(self, now=None):
+        now = now or time.time()
+        jobs = self.due(now)
+        if not jobs:
+            return None
+        with PASS_SECONDS.time():
+            ctx = await self.prepare() if self.prepare else None
+            for job in jobs:
+                try:
+                    result = job.func(ctx)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception as e:
+                    SILENT_FAILURES.inc(where=job.name)
+                    print(f"❌ {job.name} 작업 오류 (다음에 다시): {e}")
+                    continue
+                job.done = job.period(now)
+        return ctx
+
+    # 처음에는 모두 바로 돌고, 그 뒤로는 가장 가까운 경계마다 깬다 (매번 벽시계로 다시 계산하므로 밀리지 않음)
+    async def run(self, on_pass=None):
+        while True:
+            try:
+                ctx = await self.tick()
+            except Exception as e:
+                SILENT_FAILURES.inc(where="scheduler")
+                print(f"❌ 스캔 패스 오류: {e}")
+                ctx = None
+            if ctx is not None and on_pass is not None:
+                on_pass(ctx)
+            now = time.time()
+            await asyncio.sleep(max(self.next_wake(now) - now, 0) + self.settle)
@@ -0,0 +1,212 @@
+import asyncio, math, os, time, zlib
+import multiprocessing as mp
+from multiprocessing.connection import wait
+import exchange, telegram
+from engine import ScanEngine, REPORT_INTERVAL, make_store, store_history
+from scheduler import Scheduler
+from candle_store import INTERVAL_SECONDS
+from resample import can_derive
+from snapshot import load_snapshot, save_snapshot
+from metrics import SILENT_FAILURES
+
+# 🧩 샤드 스캔: 종목을 프로세스 여러 개에 나눠 같은 전략을 돌리고, 결과를 합쳐 시장/주기별 보고서 하나로
+# 샤드 프로세스는 계속 살아 있으면서 자기 몫 종목의 캔들 캐시와 이벤트 색인을 들고 있는다
+# 종목은 이름 해시로 나누므로 패스가 바뀌어도 같은 샤드로 간다
+MARKETS = ("KRW", "BTC", "USDT")
+INTERVALS = ("day",)
+SHARD_TIMEOUT = 600     # 캐시가 빈 샤드가 처음부터 다 받는 시간보다 이만큼 더 기다려도 없으면 멈춘 것으로 본다
+
+def shard_of(ticker, count):
+    return zlib.crc32(ticker.encode()) % count
+
+# 주기 -> (캔들 저장소 주기, 저장소 크기를 정하는 주기)
+# base 가 있으면 시장마다 기본 캔들 저장소 하나를 모든 주기가 같이 쓴다 (주기가 늘어도 요청은 그대로)
+def store_plan(intervals, base=None):
+    derived = [i for i in intervals if base and can_derive(base, i)]
+    longest = max(derived, key=INTERVAL_SECONDS.get) if derived else None
+    return {i: (base, longest) if i in derived else (i, i) for i in intervals}
+
+def _worker(conn, index, count, strategy_classes, base=None, intervals=INTERVALS):
+    # 요청 한도는 샤드 수만큼 나눠 쓴다 (버킷이 프로세스마다 따로 있으므로)
+    for bucket in exchange.buckets.values():
+        bucket.rate /= count
+    plan = store_plan(intervals, base)
+    stores = {}     # (market, 캔들 주기) -> (저장소, 스냅샷 경로)
+    engines = {}
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    while True:
+        request = conn.recv()
+        if request is None:
+            break
+        market, interval, tickers = request
+        engine = engines.get((market, interval))
+        source, sized = plan[interval]
+        if (market, source) not in stores:
+            store = make_store(sized, source)
+            path = f"candle_snapshot.{market}.{source}.{index}.bin"
+            load_snapshot(path, store)
+            stores[(market, source)] = (store, path)
+        store, path = stores[(market, source)]
+        if engine is None:
+            engine = ScanEngine([cls() for cls in strategy_classes], fiat=market, interval=interval,
+                                base=source, store=store,
+                                events_path=f"signal_events.{market}.{interval}.{index}.json")
+            engines[(market, interval)] = engine
+        try:
+            parts = loop.run_until_complete(engine.collect(tickers))
+        except Exception as e:
+            print(f"❌ 샤드 {index} {market}/{interval} 오류: {e}")
+            parts = [None] * len(strategy_classes)
+        conn.send(parts)
+        save_snapshot(path, store, tickers)
+    # 스케줄러 작업자 등 남은 작업을 정리하고 닫는다
+    tasks = asyncio.all_tasks(loop)
+    for task in tasks:
+        task.cancel()
+    loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+    loop.close()
+
+class ShardedScanner:
+    def __init__(self, strategy_classes, shards=None, markets=MARKETS, intervals=INTERVALS, base=None):
+        self.strategy_classes = list(strategy_classes)
+        self.reporters = [cls() for cls in self.strategy_classes]   # 합친 결과로 report() 만 한다
+        self.count = shards or os.cpu_count() or 1
+        self.markets = list(markets)
+        self.intervals = list(intervals)
+        self.base = base
+        self.shards = [None] * self.count     # (process, conn)
+        self.tickers = {}                     # market -> 마지막으로 받은 종목 목록
+
+    # 죽은 샤드는 다음 패스 전에 다시 띄운다 (캐시는 처음부터)
+    def start(self):
+        context = mp.get_context("spawn")
+        for i, shard in enumerate(self.shards):
+            if shard is not None and shard[0].is_alive():
+                continue
+            conn, child = context.Pipe()
+            process = context.Process(target=_worker, args=(child, i, self.count, self.strategy_classes,
+                                                                self.base, self.intervals),
+                                      name=f"shard-{i}", daemon=True)
+            process.start()
+            self.shards[i] = (process, conn)
+
+    def stop(self):
+        for shard in self.shards:
+            if shard is None:
+                continue
+            process, conn = shard
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+            process.join(timeout=5)
+        self.shards = [None] * self.count
+
+    async def refresh_tickers(self, market):
+        try:
+            self.tickers[market] = await exchange.aget_tickers(fiat=market)
+        except Exception as e:
+            SILENT_FAILURES.inc(where="tickers")
+            print(f"❌ {market} 종목 목록 조회 실패 (이전 목록 사용): {e}")
+        return self.tickers.get(market, [])
+
+    # 응답이 없거나 끊긴 샤드는 죽이고 이번 패스에서 뺀다 (다음 start() 에서 다시 띄움)
+    def _drop(self, i, reason):
+        SILENT_FAILURES.inc(where="shard")
+        print(f"❌ 샤드 {i} 응답 없음: {reason}")
+        process, conn = self.shards[i]
+        process.kill()
+        process.join(timeout=5)
+        conn.close()
+        self.shards[i] = None
+
+    # 샤드마다 캐시가 비어 모든 종목을 처음부터 받을 때 걸리는 시간 (요청 수 / 샤드 몫의 캔들 요청 한도)
+    # 같은 시장의 같은 저장소를 쓰는 주기는 한 번만 받으므로 한 번만 센다
+    def _budget(self, plan):
+        rate = exchange.buckets['candle'].rate / self.count
+        stores = store_plan(self.intervals, self.base)
+        requests, seen = [0] * self.count, set()
+        for (market, interval), subsets in plan:
+            source, sized = stores[interval]
+            if (market, source) in seen:
+                continue
+            seen.add((market, source))
+            pages = math.ceil(store_history(sized, source) / exchange.MAX_CANDLES)
+            for i, subset in enumerate(subsets):
+                requests[i] += pages * len(subset)
+        return max(requests) / rate
+
+    # 모든 단위를 샤드마다 한꺼번에 보내 두고 (샤드는 받은 순서대로 처리) 같은 순서로 받는다
+    # 기한은 패스 전체에 하나 (일의 양에 맞춰 늘린다). 그 안에 다 못 보낸 샤드는 멈춘 것으로 본다
+    def _dispatch(self, plan, timeout=SHARD_TIMEOUT):
+        limit = timeout + self._budget(plan)
+        deadline = time.monotonic() + limit
+        for unit, subsets in plan:
+            for i, subset in enumerate(subsets):
+                if self.shards[i] is None:
+                    continue
+                try:
+                    self.shards[i][1].send(unit + (subset,))
+                except OSError as e:
+                    self._drop(i, repr(e))
+        results = [[None] * self.count for _ in plan]
+        received = [0] * self.count
+        pending = {self.shards[i][1]: i for i in range(self.count) if self.shards[i] is not None and plan}
+        while pending:
+            left = deadline - time.monotonic()
+            if left <= 0:
+                for i in list(pending.values()):
+                    self._drop(i, f"{limit:.0f}초 초과")
+                break
+            for conn in wait(list(pending), timeout=left):
+                i = pending[conn]
+                try:
+                    results[received[i]][i] = conn.recv()
+                except (EOFError, OSError) as e:
+                    del pending[conn]
+                    self._drop(i, repr(e))
+                    continue
+                received[i] += 1
+                if received[i] == len(plan):
+                    del pending[conn]
+        return results
+
+    async def run_pass(self):
+        self.start()
+        plan = []
+        for market in self.markets:
+            tickers = await self.refresh_tickers(market)
+            subsets = [[] for _ in range(self.count)]
+            for t in tickers:
+                subsets[shard_of(t, self.count)].append(t)
+            plan += [((market, interval), subsets) for interval in self.intervals]
+        results = await asyncio.get_running_loop().run_in_executor(None, self._dispatch, plan)
+        self.start()    # 이번 패스에서 뺀 샤드는 바로 다시 띄운다
+
+        reports = []
+        for ((market, interval), _), row in zip(plan, results):
+            header = f"🧩 {market} · {interval}\n\n" if (market, interval) != ("KRW", "day") else ""
+            for k, reporter in enumerate(self.reporters):
+                parts = [r[k] for r in row if r is not None and r[k] is not None]
+                if not parts:
+                    continue
+                try:
+                    report = await reporter.report(parts)
+                except Exception as e:
+                    SILENT_FAILURES.inc(where=type(reporter).__name__)
+                    print(f"❌ {type(reporter).__name__} 보고서 오류: {e}")
+                    continue
+                if report:
+                    telegram.enqueue(header + report)
+                    reports.append(header + report)
+        return reports
+
+    # 샤드는 패스마다 마감 봉 기록까지 하므로 (이벤트 색인이 봉마다 한 번만 기록) 정각 작업 하나로 돈다
+    async def run(self):
+        scheduler = Scheduler()
+        scheduler.add("scan", REPORT_INTERVAL, lambda ctx: self.run_pass())
+        try:
+            await scheduler.run()
+        finally:
+            self.stop()
@@ -0,0 +1,51 @@
+from collections import Counter
+
+# 🗂️ 조건 충족 기록: 문자열 대신 슬롯 레코드로 저장하고 (day, ticker, condition) 로 색인
+# 변동률은 숫자(%)로 들고 있다가 출력할 때만 문자열로 바꾼다. 계산할 수 없으면 None
+class Signal:
+    __slots__ = ('day', 'ticker', 'condition', 'change', 'yesterday')
+
+    def __init__(self, day, ticker, condition, change, yesterday):
+        self.day = day
+        self.ticker = ticker
+        self.condition = condition
+        self.change = change
+        self.yesterday = yesterday
+
+    @property
+    def symbol(self):
+        return self.ticker.split("-", 1)[-1]
+
+def format_rate(rate):
+    return f"{rate:+.2f}%" if rate is not None else "N/A"
+
+class SignalStore:
+    def __init__(self):
+        self.records = {}       # (day, ticker, condition) -> Signal
+        self.days = {}          # day -> {ticker: Signal} (기록 순서 유지)
+
+    # 같은 날 같은 종목은 처음 잡힌 조건 하나만 남긴다 (기존 요약 규칙)
+    def add(self, day, ticker, condition, change, yesterday):
+        bucket = self.days.setdefault(day, {})
+        if ticker in bucket:
+            return False
+        record = Signal(day, ticker, condition, change, yesterday)
+        bucket[ticker] = record
+        self.records[(day, ticker, condition)] = record
+        return True
+
+    def clear(self, day):
+        for ticker, record in self.days.pop(day, {}).items():
+            del self.records[(day, ticker, record.condition)]
+
+    def day(self, day):
+        return list(self.days.get(day, {}).values())
+
+    # 조건별 목록, 오늘 변동률 높은 순 (N/A 는 맨 뒤)
+    def by_condition(self, day, condition):
+        rows = [r for r in self.day(day) if r.condition == condition]
+        return sorted(rows, key=lambda r: r.change if r.change is not None else -999, reverse=True)
+
+    # 여러 날에 걸쳐 몇 번 잡혔는지 (종목 심볼 기준)
+    def symbol_counts(self, days):
+        return Counter(r.symbol for d in days for r in self.day(d))
@@ -0,0 +1,88 @@
+import json, os, time
+import numpy as np
+import pandas as pd
+from candle_store import COLUMNS
+
+# 💾 재시작용 캔들 스냅샷: 캔들 저장소와 종목 목록을 파일 하나에 남긴다
+# [머리말 길이 8바이트][JSON 머리말][배열들 ...] 구조이고, 배열은 np.memmap 으로 바로 연다 (읽기 전용 뷰)
+# 다시 켜면 파일에서 바로 복원하고, 그 사이 비어 있는 봉만 받는다
+ALIGN = 64
+
+def _pad(offset):
+    return -offset % ALIGN
+
+def save_snapshot(path, store, tickers=()):
+    if not path:
+        return
+    with store.lock:
+        names = list(store.entries)
+        frames = [store.ring.window(t) for t in names]
+        saved = [store.entries[t] for t in names]
+    lengths = np.array([len(df) for df in frames], dtype=np.int64)
+    arrays = {
+        'offsets': np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+        'saved': np.array(saved, dtype=np.float64),
+        'index': np.concatenate([df.index.values.astype('datetime64[ns]').view(np.int64) for df in frames])
+                 if frames else np.zeros(0, dtype=np.int64),
+        'values': np.concatenate([df[COLUMNS].to_numpy(dtype=np.float64) for df in frames])
+                  if frames else np.zeros((0, len(COLUMNS))),
+    }
+    layout, offset = {}, 0
+    for name, array in arrays.items():
+        layout[name] = {'dtype': array.dtype.str, 'shape': array.shape, 'offset': offset}
+        offset += array.nbytes + _pad(array.nbytes)
+    header = json.dumps({
+        'interval': store.interval, 'history': store.history, 'written': time.time(),
+        'names': names, 'tickers': list(tickers), 'arrays': layout,
+    }).encode('utf-8')
+    header += b' ' * _pad(8 + len(header))
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(len(header).to_bytes(8, 'little'))
+            f.write(header)
+            for array in arrays.values():
+                f.write(np.ascontiguousarray(array).tobytes())
+                f.write(b'\0' * _pad(array.nbytes))
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"❌ 캔들 스냅샷 저장 실패: {e}")
+
+def _open(path):
+    with open(path, 'rb') as f:
+        size = int.from_bytes(f.read(8), 'little')
+        meta = json.loads(f.read(size))
+    base = 8 + size
+    arrays = {}
+    for name, spec in meta['arrays'].items():
+        shape = tuple(spec['shape'])
+        arrays[name] = (np.memmap(path, dtype=np.dtype(spec['dtype']), mode='r', offset=base + spec['offset'], shape=shape)
+                        if np.prod(shape) else np.zeros(shape, dtype=np.dtype(spec['dtype'])))
+    return meta, arrays
+
+# 스냅샷을 저장소에 채우고 저장해 둔 종목 목록을 돌려준다 (없거나 맞지 않으면 빈 목록)
+# 마지막 봉이 아직 진행 중인 봉이면 저장 시각을 그대로 써서 TTL 안에서는 다시 받지 않는다
+def load_snapshot(path, store):
+    if not path or not os.path.exists(path):
+        return []
+    try:
+        meta, arrays = _open(path)
+        if meta['interval'] != store.interval:
+            return meta['tickers']
+        offsets, saved = arrays['offsets'], arrays['saved']
+        index = pd.DatetimeIndex(arrays['index'].view('datetime64[ns]'))
+        names = meta['names'][-store.max_size:]
+        skip = len(meta['names']) - len(names)
+        for i, ticker in enumerate(names, start=skip):
+            start, end = int(offsets[i]), int(offsets[i + 1])
+            start = max(start, end - store.history)
+            current = store.missing_count(pd.DataFrame(index=index[end - 1:end])) == 1
+            store.restore(ticker, arrays['index'][start:end], arrays['values'][start:end],
+                          float(saved[i]) if current else 0.0)
+        return meta['tickers']
+    except Exception as e:
+        print(f"❌ 캔들 스냅샷 읽기 실패 (처음부터 다시 받음): {e}")
+        for ticker in list(store.entries):
+            store.ring.release(ticker)
+        store.entries.clear()
+        return []
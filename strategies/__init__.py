@@ -0,0 +1,2 @@
+from strategies.crossover import CrossoverStrategy
+from strategies.support import SupportStrategy
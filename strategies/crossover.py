@@ -0,0 +1,155 @@
+import pandas as pd
+from datetime import datetime, timezone
+import indicators
+from candle_store import KST
+from rolling import BandState
+from breadth import MarketBreadth, ratio_text
+from signals import SignalStore, format_rate
+from btc_summary import get_btc_summary_block
+
+# 📈 BBD / MA / BBU 돌파 전략 (D-day 는 실시간 가격, D+1/D+2 는 마감 종가 기준)
+MIN_HISTORY = 125
+DAYS = [0, 1, 2]
+EMOJI_MAP = {"BBD": "📉", "MA": "➖", "BBU": "📈"}
+DAY_LABELS = {0: "🔥 D-day ━━", 1: "⏳ D+1 ━━", 2: "⌛ D+2 ━━"}
+
+def rate(price, base):
+    return float((price - base) / base * 100) if base else None
+
+# 오늘 변동률, 전일 변동률 (%)
+def day_changes(df, price):
+    return rate(price, df['open'].iat[-1]), rate(df['close'].iat[-2], df['open'].iat[-2])
+
+# 체결 시각이 속한 일봉의 시작 시각 (캔들 인덱스와 같은 KST 표기)
+def candle_time(timestamp_ms):
+    utc = datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc)
+    start = utc.replace(hour=0, minute=0, second=0, microsecond=0)
+    return pd.Timestamp(start.astimezone(KST).replace(tzinfo=None))
+
+class CrossoverStrategy:
+    def __init__(self, streaming=False):
+        self.streaming = streaming      # 실시간 모드면 D-day 는 시세 구독으로만 갱신
+        self.signals = SignalStore()
+        self.band_states = {}           # ticker -> BandState
+        self.breadth = MarketBreadth()
+        self.stream_candle = None       # 실시간 모드에서 마지막으로 본 일봉 시작 시각
+
+    async def scan(self, ctx, engine):
+        return await self.report([self.collect(ctx, engine)], ctx)
+
+    # 이번 패스의 판단 결과 (샤드 프로세스끼리 주고받을 수 있는 기본 자료형만)
+    def collect(self, ctx, engine):
+        if not (self.streaming and self.band_states):
+            self.signals.clear(0)  # 이번 패스 결과로 교체
+            self.check_live(ctx)
+            self.stream_candle = candle_time(int(ctx.snapshot.taken_at * 1000))
+        self.signals.clear(1)
+        self.signals.clear(2)
+        self.check_past(ctx, engine, [1, 2])
+        return {
+            'signals': [(r.day, r.ticker, r.condition, r.change, r.yesterday) for d in DAYS for r in self.signals.day(d)],
+            'breadth': self.breadth.counts(ctx.frames, DAYS),
+        }
+
+    # 여러 샤드의 결과를 합쳐 보고서 하나로 (ctx 가 있으면 BTC 일봉을 거기서 재사용)
+    async def report(self, parts, ctx=None):
+        signals = SignalStore()
+        breadth = {i: (0, 0) for i in DAYS}
+        for part in parts:
+            for record in part['signals']:
+                signals.add(*record)
+            for i, (up, down) in part['breadth'].items():
+                breadth[i] = (breadth[i][0] + up, breadth[i][1] + down)
+        return await self.render(signals, breadth, ctx)
+
+    # D-day 조건: 종목별 밴드 상태에 실시간 가격만 반영해 다시 판단 (종목당 O(1))
+    def check_live(self, ctx):
+        for ticker, df in ctx.frames.items():
+            if len(df) < MIN_HISTORY:
+                continue
+            state = self.band_states.get(ticker)
+            state = state.sync(df) if state else BandState.from_frame(df)
+            self.band_states[ticker] = state
+            price = ctx.snapshot.get(ticker) or 0
+            if price:
+                state.update(price)
+            hits = state.crossed()
+            if not hits:
+                continue
+            change, yesterday = day_changes(df, price)
+            for condition in hits:
+                self.signals.add(0, ticker, condition, change, yesterday)
+
+    # 과거 조건: 마감된 봉의 돌파는 엔진 이벤트 색인에서 그날 기록만 꺼낸다 (다시 계산하지 않음)
+    def check_past(self, ctx, engine, day_indexes):
+        for i in day_indexes:
+            candles = {df.index[-1 - i] for df in ctx.frames.values() if len(df) > i}
+            candidates = [t for candle in candles for t in engine.events.on(candle) if t in ctx.rows]
+            for ticker in sorted(set(candidates), key=ctx.rows.get):
+                df = ctx.frames[ticker]
+                if len(df) < MIN_HISTORY:
+                    continue
+                kinds = {e.kind for e in engine.events.on(df.index[-1 - i]).get(ticker, [])}
+                change, yesterday = day_changes(df, df['close'].iat[-1])
+                for condition in indicators.CONDITIONS:
+                    if condition in kinds:
+                        self.signals.add(i, ticker, condition, change, yesterday)
+
+    # 실시간 시세 한 건: 바뀐 종목 하나만 다시 판단하고 새 돌파는 바로 알린다
+    def on_tick(self, msg, engine):
+        ticker = msg['code']
+        price = msg['trade_price']
+        state = self.band_states.get(ticker)
+        if state is None:
+            return []
+        candle = candle_time(msg['trade_timestamp'])
+        if self.stream_candle is None or candle > self.stream_candle:
+            self.stream_candle = candle
+            self.signals.clear(0)  # 새 일봉이 열리면 D-day 목록을 비운다
+        if state.last_time is not None and candle > state.last_time:
+            state.roll(price, candle)  # 일봉 마감
+        else:
+            state.update(price)
+        hits = state.crossed()
+        if not hits:
+            return []
+
+        change = rate(price, msg.get('opening_price') or 0)
+        yesterday = None
+        df = engine.candles(ticker, engine.interval)
+        if df is not None and len(df) >= 2:
+            row = df.iloc[-2] if df.index[-1] >= candle else df.iloc[-1]
+            yesterday = rate(row['close'], row['open'])
+        alerts = []
+        for condition in hits:
+            if self.signals.add(0, ticker, condition, change, yesterday):
+                symbol = ticker.split("-", 1)[-1]
+                alerts.append(f"🚨 {symbol} {condition} 돌파  {format_rate(change)} ({format_rate(yesterday)})")
+        return alerts
+
+    async def render(self, signals, breadth, ctx=None):
+        msg = await get_btc_summary_block(ctx) + "\n\n"
+        msg += f"📊 Summary (UTC {datetime.now(timezone.utc).strftime('%m/%d %H:%M')})\n\n"
+
+        symbol_counts = signals.symbol_counts(DAYS)
+        # 상승/하락 비율은 세 날을 한 번에 계산 (마감된 날은 다음 일봉까지 캐시)
+        ratio_texts = ratio_text(breadth)
+
+        for i in DAYS:
+            msg += f"{DAY_LABELS[i]} {ratio_texts[i]}\n"
+            for condition in indicators.CONDITIONS:
+                records = signals.by_condition(i, condition)
+                if records:
+                    max_len = max(len(r.symbol) for r in records)
+                    msg += f"      {EMOJI_MAP[condition]} {condition}:\n"
+                    for r in records:
+                        s, change = r.symbol, format_rate(r.change)
+                        count = symbol_counts.get(s, 0)
+                        yest_part = f"({format_rate(r.yesterday)})"
+                        if count == 2:
+                            yest_part += " 🟢"
+                        elif count >= 3:
+                            yest_part += " 🔴"
+                        msg += f"            {s:<{max_len}}  {change:>8} {yest_part}\n"
+            msg += "\n"
+        return msg.strip()
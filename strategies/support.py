@@ -0,0 +1,134 @@
+import math
+import numpy as np
+from ticks import format_price
+
+# 🧠 감시 / 지지 / 전환 전략 (MA7 & BBD 동시 돌파 후 흐름)
+MIN_HISTORY = 120
+BREAKOUT_LOOKBACK = 8   # 돌파를 찾을 과거 봉 수 (D-1 ~ D-8, 이벤트 색인 보관 기간까지 늘릴 수 있다)
+
+class SupportStrategy:
+    async def scan(self, ctx, engine):
+        return await self.report([self.collect(ctx, engine)], ctx)
+
+    # 목록별 (오늘 상승률, 출력 줄). 샤드 결과는 합친 뒤 한 번에 정렬한다
+    def collect(self, ctx, engine):
+        watch_lines = []
+        support_lines = []
+        reversal_lines = []
+        unit = "원" if engine.fiat == "KRW" else f" {engine.fiat}"
+
+        for t in ctx.tickers:
+            df = ctx.frames.get(t)
+            if df is None or len(df) < MIN_HISTORY:
+                continue
+            close = df['close'].to_numpy()
+            low = df['low'].to_numpy()
+            ma7 = ctx.band(t, 'MA7')
+            bbd = ctx.band(t, 'BBD')
+            p = ctx.snapshot.get(t)
+            name = t.split("-", 1)[-1]
+            if p is None or math.isnan(bbd[-1]) or math.isnan(ma7[-1]):
+                continue
+
+            # 오늘 상승률
+            change = ((p - close[-2]) / close[-2]) * 100
+            # 전일 상승률
+            prev_change = ((close[-2] - close[-3]) / close[-3]) * 100 if len(df) >= 3 else 0.0
+
+            breakout_close = None
+            days_since = None
+
+            # 돌파 탐색: 이벤트 색인에서 D-1 ~ D-8 봉 사이 가장 최근 MA7 & BBD 동시 돌파
+            event = engine.events.last(t, "BBD", df.index[-1 - BREAKOUT_LOOKBACK], df.index[-2])
+            if event is not None:
+                breakout_close = event.close
+                days_since = (df.index[-1] - event.candle).days
+
+            # 전환 조건: 전일 종가가 지지선 위 + 오늘 저가가 지지선 아래
+            is_reversal = False
+            if close[-2] > bbd[-2] and close[-2] > ma7[-2]:
+                if low[-1] < bbd[-1] and low[-1] < ma7[-1]:
+                    is_reversal = True
+
+            # 지지 조건: 돌파 이후 + 전환 제외 + 현재가가 MA7 or BBD 위
+            is_support = False
+            if breakout_close and not is_reversal:
+                if p > ma7[-1] or p > bbd[-1]:
+                    is_support = True
+
+            # 녹색불 조건: 전략별 분기
+            is_green = False
+            if is_support and breakout_close and p > breakout_close:
+                is_green = True
+            elif is_reversal and p > ma7[-1] and p > bbd[-1]:
+                is_green = True
+            elif not is_support and not is_reversal and p > ma7[-1] and p > bbd[-1]:
+                is_green = True  # 감시 종목
+
+            flag = " 🟢" if is_green else ""
+            line = f"{name}: {format_price(p)}{unit} {change:+.2f}% ({prev_change:+.2f}%)"
+
+            # 감시 조건: 전일 종가가 지지선 아래 + 오늘 상승
+            if close[-2] < bbd[-2] and close[-2] < ma7[-2] and change > 0:
+                watch_lines.append((change, line + flag))
+
+            # 지지 종목
+            if is_support and days_since is not None:
+                support_lines.append((change, line + f" (D+{days_since})" + flag))
+
+            # 전환 종목
+            if is_reversal:
+                reversal_lines.append((change, line + flag))
+
+        return {'watch': watch_lines, 'support': support_lines, 'reversal': reversal_lines}
+
+    async def report(self, parts, ctx=None):
+        def lines(key):
+            rows = [row for part in parts for row in part[key]]
+            return "".join(line + "\n" for _, line in sorted(rows, key=lambda x: x[0], reverse=True))
+
+        msg = "📡 감시 종목(+%)\n"
+        msg += lines('watch')
+        msg += "\n⏱️ 지지 종목\n"
+        msg += lines('support')
+        msg += "\n🔄 전환 종목\n"
+        msg += lines('reversal')
+        return msg.strip()
+
+def _shift(matrix, fill=np.nan):
+    out = np.full(matrix.shape, fill, dtype=matrix.dtype)
+    out[:, 1:] = matrix[:, :-1]
+    return out
+
+# 같은 규칙을 (종목 × 일) 행렬 전체에 한 번에 적용 (과거 재현용)
+# price 를 주지 않으면 그날 종가를 현재가로 본다
+def support_history(close, low, ma7, bbd, price=None, lookback=BREAKOUT_LOOKBACK):
+    price = close if price is None else price
+    days = np.arange(close.shape[1])
+    pc, ma7p, bbdp = _shift(close), _shift(ma7), _shift(bbd)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        valid = ~np.isnan(bbd) & ~np.isnan(ma7)
+        change = (price - pc) / pc * 100
+        below_prev = (pc < bbdp) & (pc < ma7p)
+        breakout = below_prev & (close > bbd) & (close > ma7)
+
+        # 각 날 기준 직전 lookback 봉 안의 가장 최근 돌파
+        last = np.maximum.accumulate(np.where(breakout, days, -1), axis=1)
+        last = _shift(last, fill=-1)
+        has_breakout = (last >= 0) & (days - last <= lookback)
+        breakout_close = np.where(has_breakout, np.take_along_axis(close, np.maximum(last, 0), axis=1), np.nan)
+        has_breakout &= breakout_close != 0
+
+        above = (price > ma7) & (price > bbd)
+        reversal = (pc > bbdp) & (pc > ma7p) & (low < bbd) & (low < ma7)
+        support = has_breakout & ~reversal & ((price > ma7) | (price > bbd))
+        green = (support & (price > breakout_close)) | (reversal & above) | (~support & ~reversal & above)
+        watch = below_prev & (change > 0)
+    return {
+        'watch': watch & valid,
+        'support': support & valid,
+        'reversal': reversal & valid,
+        'green': green & valid,
+        'days_since': np.where(has_breakout, days - last, -1),
+        'change': change,
+    }
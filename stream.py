@@ -0,0 +1,43 @@
+import asyncio, json, uuid
+import websockets
+from metrics import CHECK_SECONDS, SILENT_FAILURES
+
+# 📶 Upbit 실시간 시세(ticker) 구독
+# 끊기거나 한동안 메시지가 없으면 다시 접속해 같은 종목을 다시 구독한다
+UPBIT_WS = "wss://api.upbit.com/websocket/v1"
+STALE_SECONDS = 60      # 이 시간 동안 아무것도 안 오면 끊긴 것으로 본다
+MAX_BACKOFF = 60
+backoff_sleep = asyncio.sleep   # 재연결 전 대기 (테스트에서 바꿔 끼운다)
+
+def subscribe_message(codes):
+    return [
+        {"ticket": str(uuid.uuid4())},
+        {"type": "ticker", "codes": list(codes), "isOnlyRealtime": True},
+    ]
+
+# on_ticker(msg) 는 종목 하나의 시세 메시지(dict)를 받는다
+async def stream_tickers(codes, on_ticker, url=UPBIT_WS):
+    backoff = 1
+    while True:
+        try:
+            async with websockets.connect(url, ping_interval=20, max_size=None) as ws:
+                await ws.send(json.dumps(subscribe_message(codes)))
+                print(f"📶 실시간 구독 시작 ({len(codes)}종목)")
+                backoff = 1
+                while True:
+                    raw = await asyncio.wait_for(ws.recv(), timeout=STALE_SECONDS)
+                    try:
+                        msg = json.loads(raw)
+                        if msg.get('type') == 'ticker':
+                            with CHECK_SECONDS.time(strategy="stream_tick"):
+                                on_ticker(msg)
+                    except Exception as e:
+                        SILENT_FAILURES.inc(where="stream_tick")
+                        print(f"❌ 실시간 처리 오류: {e}")
+        except asyncio.CancelledError:
+            raise
+        except (OSError, asyncio.TimeoutError, websockets.ConnectionClosed, websockets.InvalidHandshake) as e:
+            SILENT_FAILURES.inc(where="stream_disconnect")
+            print(f"⚠️ 실시간 연결 끊김: {e!r} - {backoff}초 후 재연결")
+        await backoff_sleep(backoff)
+        backoff = min(backoff * 2, MAX_BACKOFF)
@@ -0,0 +1,126 @@
+import asyncio, itertools, os
+import exchange
+from ratelimit import TokenBucket, backoff_delay
+from metrics import SEND_SECONDS, SEND_RETRIES, SILENT_FAILURES
+
+# 📤 텔레그램 메시지 (두 전략 보고서가 같은 클라이언트를 쓴다)
+# 보내는 쪽은 큐에 넣고 바로 돌아가고, 작업자 하나가 순서대로 한도에 맞춰 보낸다
+BOT_TOKEN = os.environ['BOT_TOKEN']
+CHAT_ID = os.environ['CHAT_ID']
+TELEGRAM_URL = f'https://api.telegram.org/bot{BOT_TOKEN}/sendMessage'
+MESSAGE_LIMIT = 4096    # 메시지 한 건 최대 길이 (UTF-16 단위)
+CHAT_RATE = 1.0         # 같은 채팅방에는 초당 1건
+GROUP_RATE = 20 / 60    # 그룹방은 분당 20건
+GROUP_BURST = 20
+
+def _units(text):
+    return len(text.encode('utf-16-le')) // 2
+
+# 한도보다 긴 한 줄은 어쩔 수 없이 글자 단위로 자른다
+def _cut(line, limit):
+    size = 0
+    for i, ch in enumerate(line):
+        size += 2 if ord(ch) > 0xFFFF else 1
+        if size > limit:
+            return line[:i], line[i:]
+    return line, ""
+
+# 줄 경계에서 한도 안으로 나눈다
+def split_message(text, limit=MESSAGE_LIMIT):
+    chunks, current = [], ""
+    for line in text.split("\n"):
+        while _units(line) > limit:
+            if current:
+                chunks.append(current)
+                current = ""
+            head, line = _cut(line, limit)
+            chunks.append(head)
+        candidate = f"{current}\n{line}" if current else line
+        if current and _units(candidate) > limit:
+            chunks.append(current)
+            current = line
+        else:
+            current = candidate
+    if current:
+        chunks.append(current)
+    return [c for c in chunks if c.strip()]
+
+class Outbox:
+    def __init__(self):
+        self.queue = None
+        self.loop = None
+        self.chat = TokenBucket(CHAT_RATE)
+        self.group = TokenBucket(GROUP_RATE, capacity=GROUP_BURST)
+
+    # 작업자는 처음 쓰는 이벤트 루프에 붙인다 (루프가 바뀌면 다시 만든다)
+    def _start(self):
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+        self.loop.create_task(self._worker())
+
+    def put(self, text):
+        if self.loop is not asyncio.get_running_loop():
+            self._start()
+        for chunk in split_message(text):
+            self.queue.put_nowait(chunk)
+
+    # 큐에 들어간 메시지가 모두 나갈 때까지 기다린다
+    async def flush(self):
+        if self.queue is not None and self.loop is asyncio.get_running_loop():
+            await self.queue.join()
+
+    async def _worker(self):
+        while True:
+            text = await self.queue.get()
+            try:
+                await self._deliver(text)
+            except Exception as e:
+                SILENT_FAILURES.inc(where="telegram")
+                print(f"[텔레그램 오류] {e}")
+            finally:
+                self.queue.task_done()
+
+    # 네트워크 오류, 429, 5xx 는 보낼 때까지 다시 시도한다. 그 밖의 4xx 는 고쳐지지 않으므로 버린다
+    async def _deliver(self, text):
+        for attempt in itertools.count():
+            await self.chat.acquire_async()
+            await self.group.acquire_async()
+            try:
+                with SEND_SECONDS.time():
+                    res = await exchange.apost(TELEGRAM_URL, data={'chat_id': CHAT_ID, 'text': text})
+            except Exception as e:
+                delay = backoff_delay(attempt)
+                print(f"[텔레그램 오류] {e} - {delay:.1f}초 후 재시도")
+            else:
+                if res.status_code == 200:
+                    return
+                if res.status_code == 429:
+                    self.chat.pause(backoff_delay(attempt, _retry_after(res)))
+                    delay = 0
+                elif res.status_code < 500:
+                    SILENT_FAILURES.inc(where="telegram")
+                    print("텔레그램 전송 실패:", res.status_code, res.text)
+                    return
+                else:
+                    delay = backoff_delay(attempt)
+            SEND_RETRIES.inc()
+            if delay:
+                await asyncio.sleep(delay)
+
+def _retry_after(res):
+    try:
+        return res.json().get('parameters', {}).get('retry_after') or res.headers.get('Retry-After')
+    except ValueError:
+        return res.headers.get('Retry-After')
+
+outbox = Outbox()
+
+# 스캔 경로는 기다리지 않는다 (큐에 넣고 바로 돌아감)
+def enqueue(text):
+    outbox.put(text)
+
+async def send_message(text):
+    outbox.put(text)
+
+async def flush():
+    await outbox.flush()
@@ -0,0 +1,6 @@
+import os, sys
+
+# 저장소 루트의 평평한 모듈을 그대로 불러온다 (telegram 은 가져올 때 환경변수를 읽는다)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('BOT_TOKEN', 'test')
+os.environ.setdefault('CHAT_ID', '0')
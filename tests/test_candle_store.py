@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+from candle_store import CandleStore, COLUMNS
+
+def frame(seed, days=10):
+    index = pd.date_range("2024-01-01 09:00", periods=days, freq="1D")
+    values = np.random.default_rng(seed).uniform(1, 100, (days, len(COLUMNS)))
+    return pd.DataFrame(values, index=index, columns=COLUMNS)
+
+# 패스 도중 LRU 로 내보내도 앞서 건넨 뷰는 다른 종목으로 바뀌지 않는다
+def test_eviction_keeps_earlier_frames_in_pass():
+    store = CandleStore(history=10, max_size=3)
+    first = store.store("KRW-T0", frame(0), reset=True)
+    expected = first.copy()
+    for i in range(1, 6):
+        store.store(f"KRW-T{i}", frame(i), reset=True)
+    assert store.lookup("KRW-T0") is None
+    pd.testing.assert_frame_equal(first, expected)
+
+# 다음 패스에서 recycle() 한 뒤에야 내보낸 행을 다시 쓴다
+def test_recycle_reuses_rows_after_pass():
+    store = CandleStore(history=10, max_size=3)
+    for i in range(6):
+        store.store(f"KRW-T{i}", frame(i), reset=True)
+    rows = len(store.ring.start)
+    store.recycle()
+    for i in range(6, 9):
+        store.store(f"KRW-T{i}", frame(i), reset=True)
+    assert len(store.ring.start) == rows
+    for i in range(6, 9):
+        np.testing.assert_allclose(store.lookup(f"KRW-T{i}")['df']['close'], frame(i)['close'])
+
+# 받은 DataFrame 에 지표 열을 붙여도 다음에 조회하는 쪽에는 보이지 않는다
+def test_added_columns_do_not_leak_between_lookups():
+    from resample import Timeframes
+    store = CandleStore(history=40, interval="minute60")
+    index = pd.date_range("2024-01-01 09:00", periods=40, freq="1h")
+    store.store("KRW-T0", pd.DataFrame(np.random.default_rng(0).uniform(1, 100, (40, len(COLUMNS))),
+                                       index=index, columns=COLUMNS), reset=True)
+    for df in (store.fresh("KRW-T0"), store.lookup("KRW-T0")['df']):
+        df['MA7'] = 1.0
+    assert list(store.lookup("KRW-T0")['df'].columns) == COLUMNS
+    frames = Timeframes("minute60")
+    base = store.lookup("KRW-T0")['df']
+    df = frames.get("KRW-T0", base, "minute240")
+    df['MA7'] = 1.0
+    assert list(frames.get("KRW-T0", base, "minute240").columns) == COLUMNS
+
+# 스레드와 이벤트 루프가 같은 종목을 동시에 놓쳐도 요청은 한 번
+def test_single_flight_across_thread_and_loop(monkeypatch):
+    import asyncio, threading, time
+    import exchange
+    calls = []
+
+    def slow_ohlcv(ticker, interval="day", count=200, to=None):
+        calls.append(ticker)
+        time.sleep(0.2)
+        return frame(1)
+
+    async def aslow_ohlcv(ticker, interval="day", count=200, to=None, priority=None):
+        return await asyncio.to_thread(slow_ohlcv, ticker, interval, count)
+
+    monkeypatch.setattr(exchange, "get_ohlcv", slow_ohlcv)
+    monkeypatch.setattr(exchange, "aget_ohlcv", aslow_ohlcv)
+    store = CandleStore(history=10)
+    results = []
+
+    async def main():
+        task = asyncio.create_task(store.aget("KRW-BTC"))
+        await asyncio.sleep(0.05)
+        thread = threading.Thread(target=lambda: results.append(store.get("KRW-BTC")))
+        thread.start()
+        results.append(await task)
+        results.append(await store.aget("KRW-BTC"))
+        await asyncio.to_thread(thread.join)
+
+    asyncio.run(main())
+    assert calls == ["KRW-BTC"]
+    assert len(results) == 3 and store.coalesced == 1
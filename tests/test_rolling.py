@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+import indicators
+from rolling import BandState
+
+# (가격 수준, 일간 변동폭): BTC 마켓 사토시 단위 ~ KRW 비트코인, 가격에 비해 거의 안 움직이는 종목까지
+SCALES = [(1e-8, 0.03), (1.0, 0.03), (1.5e8, 0.03), (1.5e8, 1e-5), (1e-8, 1e-5)]
+
+def closes(scale, vol=0.03, days=400, seed=0):
+    steps = np.random.default_rng(seed).normal(0, vol, days)
+    return scale * np.exp(np.cumsum(steps))
+
+def expected(close):
+    s = pd.Series(close)
+    ma120 = s.rolling(indicators.MA_LONG).mean()
+    std120 = s.rolling(indicators.MA_LONG).std()
+    return {
+        'MA7': s.rolling(indicators.MA_SHORT).mean().to_numpy(),
+        'MA120': ma120.to_numpy(),
+        'STD120': std120.to_numpy(),
+        'BBU': (ma120 + indicators.BB_K * std120).to_numpy(),
+        'BBD': (ma120 - indicators.BB_K * std120).to_numpy(),
+    }
+
+def assert_bands(bands, want, i, scale):
+    for name, value in bands.items():
+        np.testing.assert_allclose(value, want[name][i], rtol=1e-9, atol=scale * 1e-12, err_msg=name)
+
+# 진행 중인 봉 가격을 여러 번 바꾸고 마감하며 굴려도 pandas rolling 과 같다
+@pytest.mark.parametrize("scale, vol", SCALES)
+def test_band_state_matches_pandas_rolling(scale, vol):
+    close = closes(scale, vol)
+    want = expected(close)
+    start = indicators.MA_LONG + 1
+    index = pd.date_range("2024-01-01 09:00", periods=len(close), freq="1D")
+    state = BandState.from_frame(pd.DataFrame({'close': close[:start]}, index=index[:start]))
+    assert_bands(state.bands(), want, start - 1, scale)
+    jitter = np.random.default_rng(1).normal(0, vol / 3, (len(close), 3))
+    for i in range(start, len(close)):
+        state.roll(close[i] * (1 + jitter[i, 0]), index[i])
+        for k in (1, 2):
+            state.update(close[i] * (1 + jitter[i, k]))
+        state.update(close[i])
+        assert_bands(state.prev_bands, want, i - 1, scale)
+        assert_bands(state.bands(), want, i, scale)
+
+# 캐시 일봉과 맞출 때도 (같은 봉 / 다음 봉) 처음부터 만든 것과 같다
+@pytest.mark.parametrize("scale, vol", SCALES)
+def test_band_state_sync(scale, vol):
+    close = closes(scale, vol, days=300, seed=2)
+    df = pd.DataFrame({'close': close}, index=pd.date_range("2024-01-01 09:00", periods=len(close), freq="1D"))
+    want = expected(close)
+    state = BandState.from_frame(df.iloc[:200])
+    for end in range(200, len(df) + 1):
+        state = state.sync(df.iloc[:end])
+        assert_bands(state.bands(), want, end - 1, scale)
+
+# 행렬 계산은 종목마다 길이가 달라 앞이 NaN 으로 채워져도 종목별 rolling 과 같다
+@pytest.mark.parametrize("scale, vol", SCALES)
+def test_compute_bands_matches_pandas_rolling(scale, vol):
+    series = [closes(scale, vol, days=n, seed=n) for n in (400, 250, 121, 60)]
+    frames = [pd.DataFrame({'close': c}) for c in series]
+    bands = indicators.compute_bands(indicators.stack_field(frames, 'close'))
+    for row, close in enumerate(series):
+        want = expected(close)
+        for name, matrix in bands.items():
+            np.testing.assert_allclose(matrix[row, -len(close):], want[name], rtol=1e-9, atol=scale * 1e-12,
+                                       equal_nan=True, err_msg=name)
+            assert np.isnan(matrix[row, :-len(close)]).all()
@@ -0,0 +1,65 @@
+import asyncio
+import stream
+from fake_feed import FakeTickerFeed
+
+# 연결이 끊기면 백오프만큼 쉬고 다시 붙어 같은 종목을 다시 구독한다
+def test_stream_reconnects_and_resubscribes(monkeypatch):
+    delays = []
+
+    async def fast_sleep(delay):
+        delays.append(delay)
+        await asyncio.sleep(0)
+
+    monkeypatch.setattr(stream, "backoff_sleep", fast_sleep)
+
+    async def main():
+        feed = await FakeTickerFeed().start()
+        received = []
+        task = asyncio.create_task(stream.stream_tickers(["KRW-BTC"], received.append, url=feed.url))
+        try:
+            await asyncio.wait_for(feed.wait_for_clients(), 5)
+            await feed.publish("KRW-BTC", 100.0)
+            while not received:
+                await asyncio.sleep(0.01)
+
+            await feed.drop_clients()
+            while feed.subscriptions < 2:
+                await asyncio.sleep(0.01)
+            await asyncio.wait_for(feed.wait_for_clients(), 5)
+            await feed.publish("KRW-BTC", 101.0)
+            await feed.publish("KRW-ETH", 5.0)
+            while len(received) < 2:
+                await asyncio.sleep(0.01)
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            await feed.stop()
+        return received
+
+    received = asyncio.run(main())
+    assert [m['trade_price'] for m in received] == [100.0, 101.0]
+    assert delays == [1]
+
+# 계속 접속에 실패하면 대기 시간이 두 배씩 늘어 MAX_BACKOFF 에서 멈춘다
+def test_stream_backoff_grows_while_down(monkeypatch):
+    delays = []
+
+    async def fast_sleep(delay):
+        delays.append(delay)
+        await asyncio.sleep(0)
+
+    monkeypatch.setattr(stream, "backoff_sleep", fast_sleep)
+    monkeypatch.setattr(stream, "MAX_BACKOFF", 8)
+
+    async def main():
+        feed = await FakeTickerFeed().start()
+        url = feed.url
+        await feed.stop()
+        task = asyncio.create_task(stream.stream_tickers(["KRW-BTC"], lambda msg: None, url=url))
+        while len(delays) < 6:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(main())
+    assert delays[:6] == [1, 2, 4, 8, 8, 8]
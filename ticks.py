@@ -0,0 +1,30 @@
+# 📐 호가 단위 및 포맷
+def get_tick_size(price):
+    if price >= 2_000_000: return 1000
+    elif price >= 1_000_000: return 1000
+    elif price >= 500_000: return 500
+    elif price >= 100_000: return 100
+    elif price >= 50_000: return 50
+    elif price >= 10_000: return 10
+    elif price >= 5_000: return 5
+    elif price >= 1_000: return 1
+    elif price >= 100: return 1
+    elif price >= 10: return 0.1
+    elif price >= 1: return 0.01
+    elif price >= 0.1: return 0.001
+    elif price >= 0.01: return 0.0001
+    elif price >= 0.001: return 0.00001
+    elif price >= 0.0001: return 0.000001
+    elif price >= 0.00001: return 0.0000001
+    else: return 0.00000001
+
+def format_price(price):
+    tick = get_tick_size(price)
+    try:
+        tick_str = f"{tick:.10f}".rstrip('0')
+        precision = tick_str[::-1].find('.') if '.' in tick_str else 0
+        rounded = round(price / tick) * tick
+        return f"{rounded:.{precision}f}"
+    except Exception as e:
+        print(f"format_price 오류: {e}")
+        return str(price)